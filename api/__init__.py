@@ -1,6 +1,6 @@
 from flask import Flask, request
 from .config import Config
-from .database import db
+from .database import db, STICKY_COOKIE
 from flask_jwt_extended import JWTManager
 from flask_swagger_ui import get_swaggerui_blueprint
 from flask_cors import CORS
@@ -15,11 +15,22 @@ from .routes.transactions import transaction_bp
 from .routes.services import service_bp
 from .routes.employees import employee_bp
 from .routes.notifications import notification_bp
+from .routes.metrics import metrics_bp
+from .routes.analytics import analytics_bp
+from .routes.sync import sync_bp
+from .commands import register_commands
+from .utils.helpers import purge_expired_tokens
+from .utils.scheduler import PeriodicJob
+from .utils.jobs import job_registry
+from .utils.rollups import refresh_daily_rollups
+from .utils.json_provider import FastJSONProvider
+from .utils.db_metrics import pool_metrics
 from azure.storage.blob import BlobServiceClient
-import os, uuid
+import os, uuid, time
 
 def create_app():
     app = Flask(__name__)
+    app.json = FastJSONProvider(app)
     CORS(
    app, 
    origins=["http://localhost:5173"],
@@ -30,6 +41,29 @@ def create_app():
 
     db.init_app(app)
 
+    with app.app_context():
+       for bind, engine in db.engines.items():
+          pool_metrics.install(bind or "primary", engine)
+
+    @app.after_request
+    def stick_to_primary(response):
+       # Read-your-writes: after a successful write, this client reads from
+       # the primary until the replicas have had time to catch up
+       if (
+          app.config["SQLALCHEMY_REPLICA_BINDS"]
+          and request.method not in ("GET", "HEAD", "OPTIONS")
+          and response.status_code < 400
+       ):
+          sticky_seconds = app.config["REPLICA_STICKY_SECONDS"]
+          response.set_cookie(
+             STICKY_COOKIE,
+             str(time.time() + sticky_seconds),
+             max_age=sticky_seconds,
+             httponly=True,
+             samesite="Lax",
+          )
+       return response
+
     migrate = Migrate()
     migrate.init_app(app, db)
 
@@ -40,6 +74,32 @@ def create_app():
     jwt = JWTManager()
     jwt.init_app(app)
 
+    register_commands(app)
+
+    if app.config["TOKEN_PURGE_INTERVAL"]:
+       PeriodicJob(
+          app,
+          app.config["TOKEN_PURGE_INTERVAL"],
+          lambda: purge_expired_tokens(app.config["TOKEN_PURGE_BATCH_SIZE"]),
+          name="purge-tokens",
+       ).start()
+
+    if app.config["ROLLUP_INTERVAL"]:
+       PeriodicJob(
+          app,
+          app.config["ROLLUP_INTERVAL"],
+          refresh_daily_rollups,
+          name="rollup-daily",
+       ).start()
+
+    if app.config["JOB_RESUME_INTERVAL"]:
+       PeriodicJob(
+          app,
+          app.config["JOB_RESUME_INTERVAL"],
+          lambda: job_registry.resume_stale(app, app.config["JOB_STALE_AFTER"]),
+          name="resume-jobs",
+       ).start()
+
     connect_str = os.getenv('AZURE_CONN_STRING')
     blob_service_client = BlobServiceClient.from_connection_string(connect_str)
     container_name = 'data'
@@ -68,6 +128,9 @@ def create_app():
     app.register_blueprint(customer_bp)
     app.register_blueprint(employee_bp)
     app.register_blueprint(notification_bp)
+    app.register_blueprint(metrics_bp)
+    app.register_blueprint(analytics_bp)
+    app.register_blueprint(sync_bp)
 
     @app.post('/api/v1/upload-image/')
     def upload_image():
@@ -101,6 +164,12 @@ def create_app():
         }, HTTP_500_INTERNAL_SERVER_ERROR
 
 
+    @app.errorhandler(HTTP_400_BAD_REQUEST)
+    def handle_400(e):
+       return {
+          "error" : e.description
+       }, HTTP_400_BAD_REQUEST
+
     @app.errorhandler(HTTP_404_NOT_FOUND)
     def handle_404(e):
        return {
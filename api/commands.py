@@ -0,0 +1,47 @@
+import click
+from flask.cli import with_appcontext
+from flask import current_app
+from .utils.helpers import purge_expired_tokens
+from .utils.explain import ROUTES, find_full_scans
+from .utils.rollups import refresh_daily_rollups
+
+
+@click.command("purge-tokens")
+@click.option("--batch-size", type=int, default=None, help="Rows deleted per transaction.")
+@with_appcontext
+def purge_tokens_command(batch_size):
+    """Delete expired refresh tokens from the token blocklist."""
+    batch_size = batch_size or current_app.config["TOKEN_PURGE_BATCH_SIZE"]
+    deleted = purge_expired_tokens(batch_size)
+    click.echo(f"Purged {deleted} expired tokens")
+
+
+@click.command("explain-queries")
+@with_appcontext
+def explain_queries_command():
+    """Request the list endpoints, EXPLAIN their queries and fail on any full scan or sort."""
+    full_scans = find_full_scans()
+
+    for route in ROUTES:
+        if route in full_scans:
+            click.echo(f"FAIL {route}: {'; '.join(full_scans[route])}")
+        else:
+            click.echo(f"ok   {route}")
+
+    if full_scans:
+        raise SystemExit(1)
+
+
+@click.command("rollup-daily")
+@click.option("--full", is_flag=True, help="Rebuild every day instead of the rows changed since the last run.")
+@with_appcontext
+def rollup_daily_command(full):
+    """Refresh the per-day, per-car reporting rollups."""
+    refreshed = refresh_daily_rollups(full=full)
+    click.echo(f"Refreshed {refreshed} daily rollups")
+
+
+def register_commands(app):
+    app.cli.add_command(purge_tokens_command)
+    app.cli.add_command(explain_queries_command)
+    app.cli.add_command(rollup_daily_command)
@@ -1,11 +1,49 @@
 from dotenv import load_dotenv
 import os
 from datetime import timedelta
+from .utils.db_metrics import InstrumentedQueuePool
 
 load_dotenv()
 
+
+def engine_options(uri):
+    """
+    Connection pool settings for SQLALCHEMY_ENGINE_OPTIONS.
+    SQLite manages its own pool, so it only gets pre-ping.
+    """
+    pre_ping = os.getenv('DB_POOL_PRE_PING', 'true').lower() == 'true'
+
+    if not uri or uri.startswith('sqlite'):
+        return {'pool_pre_ping': pre_ping}
+
+    return {
+        'poolclass': InstrumentedQueuePool,
+        'pool_size': int(os.getenv('DB_POOL_SIZE', 10)),
+        'max_overflow': int(os.getenv('DB_MAX_OVERFLOW', 20)),
+        'pool_timeout': int(os.getenv('DB_POOL_TIMEOUT', 30)),
+        # Recycle before MySQL's wait_timeout closes idle connections
+        'pool_recycle': int(os.getenv('DB_POOL_RECYCLE', 1800)),
+        'pool_pre_ping': pre_ping,
+    }
+
+
+def replica_binds(uris):
+    """
+    One bind per comma separated replica URI, each with its own pool settings.
+    """
+    uris = [uri.strip() for uri in (uris or '').split(',') if uri.strip()]
+    return {f'replica_{i}': {'url': uri, **engine_options(uri)} for i, uri in enumerate(uris)}
+
+
 class Config:
     SQLALCHEMY_DATABASE_URI = os.getenv('SQLALCHEMY_DATABASE_URI')
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(SQLALCHEMY_DATABASE_URI)
+
+    # Read replicas used by GET requests, the primary takes every write
+    SQLALCHEMY_BINDS = replica_binds(os.getenv('SQLALCHEMY_REPLICA_URIS'))
+    SQLALCHEMY_REPLICA_BINDS = list(SQLALCHEMY_BINDS)
+    # Seconds a client keeps reading from the primary after a write
+    REPLICA_STICKY_SECONDS = int(os.getenv('REPLICA_STICKY_SECONDS', 10))
     SECRET_KEY = os.getenv('SECRET_KEY')
     JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY')
     # JWT_TOKEN_LOCATION = os.getenv('JWT_TOKEN_LOCATION')
@@ -14,4 +52,44 @@ class Config:
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(minutes=15)
     JWT_REFRESH_TOKEN_EXPIRES = timedelta(days=30)
     JWT_COOKIE_SECURE = False
-    JWT_COOKIE_SAMESITE = "Lax"
\ No newline at end of file
+    JWT_COOKIE_SAMESITE = "Lax"
+
+    # Check every response against its schema, meant for debugging and tests
+    VALIDATE_RESPONSES = os.getenv('VALIDATE_RESPONSES', 'false').lower() == 'true'
+
+    # Response caches are read from CATALOGUE_CACHE_* and ANALYTICS_CACHE_*
+    # in utils/cache.py. They live in each worker and a write only clears the
+    # worker that handled it, so other workers can serve the old catalogue for
+    # up to CATALOGUE_CACHE_TTL seconds. Keep it short when running several.
+
+    # Keyset pagination for list endpoints
+    DEFAULT_PAGE_SIZE = int(os.getenv('DEFAULT_PAGE_SIZE', 50))
+    MAX_PAGE_SIZE = int(os.getenv('MAX_PAGE_SIZE', 500))
+
+    # Largest list accepted by the bulk create endpoints
+    BULK_MAX_ITEMS = int(os.getenv('BULK_MAX_ITEMS', 1000))
+
+    # Users notified per transaction by a notification broadcast
+    BROADCAST_CHUNK_SIZE = int(os.getenv('BROADCAST_CHUNK_SIZE', 1000))
+
+    # Background jobs (broadcasts) whose heartbeat is older than JOB_STALE_AFTER
+    # seconds are resumed from their cursor, checked every JOB_RESUME_INTERVAL
+    # seconds (0 disables the in-process check)
+    JOB_RESUME_INTERVAL = int(os.getenv('JOB_RESUME_INTERVAL', 60))
+    JOB_STALE_AFTER = int(os.getenv('JOB_STALE_AFTER', 300))
+
+    # Seconds between keepalive comments on an idle notification stream
+    SSE_KEEPALIVE = int(os.getenv('SSE_KEEPALIVE', 15))
+
+    # Seconds re-read before a sync token, covers late commits and replica lag
+    SYNC_OVERLAP = int(os.getenv('SYNC_OVERLAP', 60))
+
+    # Rows fetched per server-side cursor batch by the streaming exports
+    EXPORT_BATCH_SIZE = int(os.getenv('EXPORT_BATCH_SIZE', 1000))
+
+    # Expired refresh token purge, interval in seconds (0 disables the in-process job)
+    TOKEN_PURGE_INTERVAL = int(os.getenv('TOKEN_PURGE_INTERVAL', 0))
+    TOKEN_PURGE_BATCH_SIZE = int(os.getenv('TOKEN_PURGE_BATCH_SIZE', 1000))
+
+    # Daily reporting rollup refresh, interval in seconds (0 disables the in-process job)
+    ROLLUP_INTERVAL = int(os.getenv('ROLLUP_INTERVAL', 0))
\ No newline at end of file
@@ -1,3 +1,60 @@
+import time
+import random
+from flask import current_app, g, request, has_request_context
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event
+from flask_sqlalchemy.session import Session
 
-db = SQLAlchemy()
\ No newline at end of file
+# Cookie marking a client that just wrote, so its reads go to the primary
+STICKY_COOKIE = "db_primary_until"
+
+
+def wants_replica():
+    if not has_request_context() or request.method not in ("GET", "HEAD"):
+        return False
+
+    if g.get("read_primary"):
+        return False
+
+    try:
+        return float(request.cookies.get(STICKY_COOKIE, 0)) < time.time()
+    except ValueError:
+        return True
+
+
+class RoutingSession(Session):
+    """
+    Sends reads of GET requests to a random replica bind, everything else
+    (writes, flushes, locking reads, non-GET requests, clients inside their
+    read-your-writes window and requests that set `g.read_primary`) goes
+    to the primary. Once a transaction has written or locked a row, the
+    rest of it stays on the primary too.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and self._replica_allowed(clause):
+            replicas = current_app.config.get("SQLALCHEMY_REPLICA_BINDS")
+            if replicas and wants_replica():
+                return self._db.engines[random.choice(replicas)]
+
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def _replica_allowed(self, clause):
+        if (
+            self._flushing
+            or getattr(clause, "is_dml", False)
+            or getattr(clause, "_for_update_arg", None) is not None
+        ):
+            self.info["primary_pinned"] = True
+            return False
+
+        return not self.info.get("primary_pinned")
+
+
+@event.listens_for(RoutingSession, "after_transaction_end")
+def unpin_primary(session, transaction):
+    if transaction.parent is None:
+        session.info.pop("primary_pinned", None)
+
+
+db = SQLAlchemy(session_options={"class_": RoutingSession})
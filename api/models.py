@@ -1,10 +1,15 @@
-from datetime import datetime
+from datetime import datetime, timedelta
 from .database import db
+from .serializers import register, serialize
 
 
 # ------------------- USERS -------------------
 class User(db.Model):
     __tablename__ = "users"
+    __table_args__ = (
+        # Ends in the primary key so keyset pages by role need no sort
+        db.Index("ix_users_role_u_id", "role", "u_id"),
+    )
 
     u_id = db.Column(db.String(36), primary_key=True)
     username = db.Column(db.String(80), unique=True, nullable=False)
@@ -12,6 +17,7 @@ class User(db.Model):
     role = db.Column(
         db.String(20), nullable=False, default="customer"
     )  # admin, employee, customer
+    updated_at = db.Column(db.DateTime, default=datetime.now, onupdate=datetime.now, index=True)
 
     # uselist=False makes sure that there will be only one to one relationship
     customer = db.relationship(
@@ -26,7 +32,7 @@ class User(db.Model):
 
 
     def as_dict(self):
-        return {c.name: getattr(self, c.name) for c in self.__table__.columns}
+        return serialize(self)
 
 
 # ------------------- CUSTOMERS -------------------
@@ -42,6 +48,7 @@ class Customer(db.Model):
     image = db.Column(db.String(255))
     address = db.Column(db.String(255))
     telephone_no = db.Column(db.String(15))
+    updated_at = db.Column(db.DateTime, default=datetime.now, onupdate=datetime.now, index=True)
 
     bookings = db.relationship(
         "Booking", backref="customer", lazy=True, cascade="all, delete"
@@ -54,7 +61,7 @@ class Customer(db.Model):
     )
 
     def as_dict(self):
-        return {c.name: getattr(self, c.name) for c in self.__table__.columns}
+        return serialize(self)
 
 
 # ------------------- EMPLOYEES -------------------
@@ -70,14 +77,18 @@ class Employee(db.Model):
     image = db.Column(db.String(255))
     address = db.Column(db.String(255))
     telephone_no = db.Column(db.String(15))
+    updated_at = db.Column(db.DateTime, default=datetime.now, onupdate=datetime.now, index=True)
 
     def as_dict(self):
-        return {c.name: getattr(self, c.name) for c in self.__table__.columns}
+        return serialize(self)
 
 
 # ------------------- CARS -------------------
 class Car(db.Model):
     __tablename__ = "cars"
+    __table_args__ = (
+        db.Index("ix_cars_availability_status_car_id", "availability_status", "car_id"),
+    )
 
     car_id = db.Column(db.String(36), primary_key=True)
     license_no = db.Column(db.String(20), unique=True, nullable=False)
@@ -93,6 +104,7 @@ class Car(db.Model):
     price_per_day = db.Column(db.Float, nullable=False)
     availability_status = db.Column(db.Boolean, default=True)
     condition = db.Column(db.String(50), nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.now, onupdate=datetime.now, index=True)
 
     bookings = db.relationship(
         "Booking", backref="car", lazy=True, cascade="all, delete"
@@ -105,12 +117,16 @@ class Car(db.Model):
     )
 
     def as_dict(self):
-        return {c.name: getattr(self, c.name) for c in self.__table__.columns}
+        return serialize(self)
 
 
 # ------------------- NOTIFICATIONS -------------------
 class Notification(db.Model):
     __tablename__ = "notifications"
+    __table_args__ = (
+        db.Index("ix_notifications_u_id_notification_id", "u_id", "notification_id"),
+        db.Index("ix_notifications_u_id_updated_at", "u_id", "updated_at"),
+    )
 
     notification_id = db.Column(db.String(36), primary_key=True)
     u_id = db.Column(
@@ -120,15 +136,22 @@ class Notification(db.Model):
     )
     text = db.Column(db.Text, nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.now)
-    updated_at = db.Column(db.DateTime, onupdate=datetime.now)
+    updated_at = db.Column(db.DateTime, default=datetime.now, onupdate=datetime.now)
 
     def as_dict(self):
-        return {c.name: getattr(self, c.name) for c in self.__table__.columns}
+        return serialize(self)
 
 
 # ------------------- BOOKINGS -------------------
 class Booking(db.Model):
     __tablename__ = "bookings"
+    __table_args__ = (
+        db.Index("ix_bookings_car_id_ends_at", "car_id", "ends_at", "booked_at"),
+        db.Index("ix_bookings_car_id_booked_at", "car_id", "booked_at"),
+        db.Index("ix_bookings_car_id_booking_id", "car_id", "booking_id"),
+        db.Index("ix_bookings_customer_id_booking_id", "customer_id", "booking_id"),
+        db.Index("ix_bookings_customer_id_updated_at", "customer_id", "updated_at"),
+    )
 
     booking_id = db.Column(db.String(36), primary_key=True)
     customer_id = db.Column(
@@ -141,18 +164,28 @@ class Booking(db.Model):
     )
     booked_at = db.Column(db.DateTime, default=datetime.now)
     time_period = db.Column(db.Integer, nullable=False)
+    # booked_at + time_period days, stored so overlap checks can use an index
+    ends_at = db.Column(db.DateTime)
     returned_at = db.Column(db.DateTime)
     status = db.Column(db.String(20), nullable=False, default="pending")
     fine = db.Column(db.Float, default=0.0)
     total = db.Column(db.Float, default=0.0)
+    updated_at = db.Column(db.DateTime, default=datetime.now, onupdate=datetime.now, index=True)
+
+    @staticmethod
+    def compute_ends_at(booked_at, time_period):
+        return booked_at + timedelta(days=time_period)
 
     def as_dict(self):
-        return {c.name: getattr(self, c.name) for c in self.__table__.columns}
+        return serialize(self)
 
 
 # ------------------- SERVICES -------------------
 class Service(db.Model):
     __tablename__ = "services"
+    __table_args__ = (
+        db.Index("ix_services_car_id_service_date", "car_id", "service_date"),
+    )
 
     service_id = db.Column(db.String(36), primary_key=True)
     car_id = db.Column(
@@ -161,14 +194,20 @@ class Service(db.Model):
     transaction_amount = db.Column(db.Float, default=0.0)
     service_date = db.Column(db.DateTime, default=datetime.now)
     details = db.Column(db.Text, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.now, onupdate=datetime.now, index=True)
 
     def as_dict(self):
-        return {c.name: getattr(self, c.name) for c in self.__table__.columns}
+        return serialize(self)
 
 
 # ------------------- TRANSACTIONS -------------------
 class Transaction(db.Model):
     __tablename__ = "transactions"
+    __table_args__ = (
+        db.Index("ix_transactions_customer_id_transaction_id", "customer_id", "transaction_id"),
+        db.Index("ix_transactions_car_id_transaction_id", "car_id", "transaction_id"),
+        db.Index("ix_transactions_car_id_date", "car_id", "date"),
+    )
 
     transaction_id = db.Column(db.String(36), primary_key=True)
     transaction_amount = db.Column(db.Float, nullable=False)
@@ -187,15 +226,18 @@ class Transaction(db.Model):
         nullable=True,
     )
     transaction_type = db.Column(db.String(20), nullable=False, default="debit")
-
+    updated_at = db.Column(db.DateTime, default=datetime.now, onupdate=datetime.now, index=True)
 
     def as_dict(self):
-        return {c.name: getattr(self, c.name) for c in self.__table__.columns}
+        return serialize(self)
 
 
 # ------------------- REVIEWS -------------------
 class Review(db.Model):
     __tablename__ = "reviews"
+    __table_args__ = (
+        db.Index("ix_reviews_customer_id_review_id", "customer_id", "review_id"),
+    )
 
     review_id = db.Column(db.String(36), primary_key=True)
     customer_id = db.Column(
@@ -207,15 +249,124 @@ class Review(db.Model):
     topic = db.Column(db.String(100))
     description = db.Column(db.Text)
     created_at = db.Column(db.DateTime, default=datetime.now)
-    updated_at = db.Column(db.DateTime, onupdate=datetime.now)
+    updated_at = db.Column(db.DateTime, default=datetime.now, onupdate=datetime.now, index=True)
+
+    def as_dict(self):
+        return serialize(self)
+
+
+# ------------------- OTP CODES -------------------
+class OTPCode(db.Model):
+    __tablename__ = "otp_codes"
+
+    key = db.Column(db.String(255), primary_key=True)
+    code_hash = db.Column(db.String(64), nullable=False)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+
+    def as_dict(self):
+        return serialize(self)
+
+
+# ------------------- SYNC TOMBSTONES -------------------
+class Tombstone(db.Model):
+    """
+    A deleted row, kept so sync clients can drop their copy of it.
+    `scope_id` is the user the row belonged to, None for shared rows.
+    """
+    __tablename__ = "tombstones"
+    __table_args__ = (
+        db.Index("ix_tombstones_deleted_at_table_name", "deleted_at", "table_name"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    table_name = db.Column(db.String(50), nullable=False)
+    row_id = db.Column(db.String(36), nullable=False)
+    scope_id = db.Column(db.String(36))
+    deleted_at = db.Column(db.DateTime, nullable=False, default=datetime.now)
+
+
+# ------------------- DAILY ROLLUPS -------------------
+class DailyCarRollup(db.Model):
+    __tablename__ = "daily_car_rollups"
+
+    day = db.Column(db.Date, primary_key=True)
+    car_id = db.Column(
+        db.String(36),
+        db.ForeignKey("cars.car_id", ondelete="CASCADE"),
+        primary_key=True,
+        index=True,
+    )
+    bookings_count = db.Column(db.Integer, nullable=False, default=0)
+    revenue = db.Column(db.Float, nullable=False, default=0.0)
+    fines = db.Column(db.Float, nullable=False, default=0.0)
+    service_spend = db.Column(db.Float, nullable=False, default=0.0)
 
     def as_dict(self):
-        return {c.name: getattr(self, c.name) for c in self.__table__.columns}
+        return serialize(self)
+
+
+class RollupPending(db.Model):
+    """
+    (day, car) pairs whose rows were deleted since the last rollup run.
+    """
+    __tablename__ = "rollup_pending"
+
+    id = db.Column(db.Integer, primary_key=True)
+    day = db.Column(db.Date, nullable=False)
+    car_id = db.Column(db.String(36), nullable=False)
+
+
+class RollupWatermark(db.Model):
+    __tablename__ = "rollup_watermarks"
+
+    name = db.Column(db.String(50), primary_key=True)
+    watermark = db.Column(db.DateTime, nullable=False)
+
+
+# ------------------- BACKGROUND JOBS -------------------
+class Job(db.Model):
+    """
+    A background job started by a request. `cursor` is how far the job got,
+    so another worker can resume it once `heartbeat_at` goes stale.
+    """
+    __tablename__ = "jobs"
+    __table_args__ = (
+        db.Index("ix_jobs_status_heartbeat_at", "status", "heartbeat_at"),
+    )
+
+    job_id = db.Column(db.String(32), primary_key=True)
+    name = db.Column(db.String(50), nullable=False)
+    status = db.Column(db.String(20), nullable=False, default="pending")
+    params = db.Column(db.JSON, nullable=False)
+    cursor = db.Column(db.String(255))
+    total = db.Column(db.Integer)
+    processed = db.Column(db.Integer, nullable=False, default=0)
+    error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.now)
+    heartbeat_at = db.Column(db.DateTime, nullable=False, default=datetime.now)
+    finished_at = db.Column(db.DateTime)
+
+    def as_dict(self):
+        return {
+            "job_id": self.job_id,
+            "name": self.name,
+            "status": self.status,
+            "total": self.total,
+            "processed": self.processed,
+            "error": self.error,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+        }
 
 
 # ------------------- TOKEN BLOCK LIST -------------------
 class Token(db.Model):
     __tablename__ = "token_blocklist"
+    __table_args__ = (
+        db.Index("ix_token_blocklist_jti_user_id", "jti", "user_id"),
+        db.Index("ix_token_blocklist_expires", "expires"),
+    )
 
     id = db.Column(db.Integer, primary_key=True, nullable=False)
     jti = db.Column(db.String(255), nullable=False)
@@ -224,4 +375,20 @@ class Token(db.Model):
     expires = db.Column(db.DateTime, default=datetime.now)
 
     def as_dict(self):
-        return {c.name: getattr(self, c.name) for c in self.__table__.columns}
+        return serialize(self)
+
+
+# ------------------- SERIALIZER VIEWS -------------------
+for model in (User, Customer, Employee, Car, Notification, Booking, Service, Transaction, Review, OTPCode, DailyCarRollup, Token):
+    register(model)
+
+register(User, "public", exclude=("password",))
+register(Customer, "nested", exclude=("customer_id",))
+register(Employee, "nested", exclude=("employee_id",))
+register(Car, "nested", exclude=("car_id",))
+register(Service, "nested", exclude=("car_id",))
+register(Booking, "by_customer", exclude=("customer_id",))
+register(Review, "by_customer", exclude=("customer_id",))
+register(Transaction, "by_customer", exclude=("customer_id",))
+register(Transaction, "by_car", exclude=("car_id",))
+register(Transaction, "by_customer_and_car", exclude=("customer_id", "car_id"))
@@ -0,0 +1,243 @@
+from flask import Blueprint, request
+from datetime import datetime, timedelta
+from sqlalchemy import func, literal_column
+from ..database import db
+from ..models import Booking, Car, DailyCarRollup, Service, Transaction
+from flask_jwt_extended import jwt_required
+from ..utils.http_status_codes import *
+from ..utils.helpers import validate_response, role_based
+from ..utils.cache import analytics_cache, cached_response
+from ..schemas import AnalyticsResponse
+
+analytics_bp = Blueprint("analytics", __name__, url_prefix="/api/v1/analytics")
+
+GROUP_BY = ("car", "day", "month")
+
+
+def get_period():
+    """
+    Parse the optional `start`/`end` query params, raises ValueError.
+    """
+    start = request.args.get("start")
+    end = request.args.get("end")
+    start = datetime.fromisoformat(start) if start else None
+    end = datetime.fromisoformat(end) if end else None
+
+    if start and end and end <= start:
+        raise ValueError("end must be after start")
+
+    return start, end
+
+
+def is_closed_period():
+    """
+    A period that ended before today can't change any more, so its
+    report is safe to cache.
+    """
+    try:
+        _, end = get_period()
+    except ValueError:
+        return False
+
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    return end is not None and end <= today
+
+
+def bucket(column, group_by):
+    if group_by == "day":
+        return func.date(column)
+
+    if db.session.get_bind().dialect.name == "sqlite":
+        return func.strftime("%Y-%m", column)
+    return func.date_format(column, "%Y-%m")
+
+
+def overlap_days(start, end):
+    """
+    Days of each booking that fall inside [start, end), clipped at both ends.
+    """
+    if db.session.get_bind().dialect.name == "sqlite":
+        # Two argument min() and max() are SQLite's least() and greatest()
+        booked_from = func.max(Booking.booked_at, start)
+        booked_until = func.min(Booking.ends_at, end)
+        return func.julianday(booked_until) - func.julianday(booked_from)
+
+    booked_from = func.greatest(Booking.booked_at, start)
+    booked_until = func.least(Booking.ends_at, end)
+    return func.timestampdiff(literal_column("SECOND"), booked_from, booked_until) / 86400
+
+
+def aggregate(date_column, car_column, group_by, *aggregates, filters=()):
+    """
+    GROUP BY car or by day/month of `date_column`, within the requested period.
+    """
+    start, end = get_period()
+
+    if isinstance(date_column.type, db.Date) and not isinstance(date_column.type, db.DateTime):
+        start = start and start.date()
+        end = end and end.date()
+
+    key = car_column if group_by == "car" else bucket(date_column, group_by)
+    query = db.session.query(key.label(group_by), *aggregates).filter(*filters)
+
+    if start:
+        query = query.filter(date_column >= start)
+    if end:
+        query = query.filter(date_column < end)
+
+    return [row._asdict() for row in query.group_by(key).order_by(key).all()]
+
+
+def report(message, build):
+    group_by = request.args.get("group_by", "car")
+
+    if group_by not in GROUP_BY:
+        return {
+            "status": "error",
+            "message": f"group_by must be one of {', '.join(GROUP_BY)}",
+            "data": None,
+        }, HTTP_400_BAD_REQUEST
+
+    try:
+        resp_data = build(group_by)
+    except ValueError as e:
+        return {
+            "status": "error",
+            "message": str(e),
+            "data": None,
+        }, HTTP_400_BAD_REQUEST
+
+    return {
+        "status": "success",
+        "message": message,
+        "data": resp_data,
+    }, HTTP_200_OK
+
+
+@analytics_bp.get("/revenue")
+@jwt_required()
+@role_based()
+@cached_response(analytics_cache, tags=lambda: ("revenue",), condition=is_closed_period)
+@validate_response(response_model=AnalyticsResponse)
+def get_revenue():
+    transaction_type = request.args.get("transaction_type")
+    filters = [Transaction.transaction_type == transaction_type] if transaction_type else []
+
+    return report("Revenue retrieved successfully", lambda group_by: aggregate(
+        Transaction.date,
+        Transaction.car_id,
+        group_by,
+        func.coalesce(func.sum(Transaction.transaction_amount), 0).label("revenue"),
+        func.count(Transaction.transaction_id).label("transactions"),
+        filters=filters,
+    ))
+
+
+@analytics_bp.get("/fines")
+@jwt_required()
+@role_based()
+@cached_response(analytics_cache, tags=lambda: ("fines",), condition=is_closed_period)
+@validate_response(response_model=AnalyticsResponse)
+def get_fines():
+    return report("Fines retrieved successfully", lambda group_by: aggregate(
+        Booking.booked_at,
+        Booking.car_id,
+        group_by,
+        func.coalesce(func.sum(Booking.fine), 0).label("fines"),
+        func.count(Booking.booking_id).label("bookings"),
+        filters=[Booking.fine > 0],
+    ))
+
+
+@analytics_bp.get("/service-costs")
+@jwt_required()
+@role_based()
+@cached_response(analytics_cache, tags=lambda: ("service-costs",), condition=is_closed_period)
+@validate_response(response_model=AnalyticsResponse)
+def get_service_costs():
+    return report("Service costs retrieved successfully", lambda group_by: aggregate(
+        Service.service_date,
+        Service.car_id,
+        group_by,
+        func.coalesce(func.sum(Service.transaction_amount), 0).label("service_cost"),
+        func.count(Service.service_id).label("services"),
+    ))
+
+
+@analytics_bp.get("/daily")
+@jwt_required()
+@role_based()
+@cached_response(analytics_cache, tags=lambda: ("daily",), condition=is_closed_period)
+@validate_response(response_model=AnalyticsResponse)
+def get_daily_rollups():
+    return report("Daily rollups retrieved successfully", lambda group_by: aggregate(
+        DailyCarRollup.day,
+        DailyCarRollup.car_id,
+        group_by,
+        func.sum(DailyCarRollup.bookings_count).label("bookings"),
+        func.sum(DailyCarRollup.revenue).label("revenue"),
+        func.sum(DailyCarRollup.fines).label("fines"),
+        func.sum(DailyCarRollup.service_spend).label("service_spend"),
+    ))
+
+
+@analytics_bp.get("/utilisation")
+@jwt_required()
+@role_based()
+@cached_response(analytics_cache, tags=lambda: ("utilisation",), condition=is_closed_period)
+@validate_response(response_model=AnalyticsResponse)
+def get_utilisation():
+    try:
+        start, end = get_period()
+    except ValueError as e:
+        return {
+            "status": "error",
+            "message": str(e),
+            "data": None,
+        }, HTTP_400_BAD_REQUEST
+
+    end = end or datetime.now()
+    start = start or end - timedelta(days=30)
+    period_days = (end - start).total_seconds() / 86400
+
+    booked_days = (
+        db.session.query(
+            Booking.car_id,
+            func.coalesce(func.sum(overlap_days(start, end)), 0).label("booked_days"),
+            func.count(Booking.booking_id).label("bookings"),
+        )
+        .filter(
+            Booking.status != "canceled",
+            Booking.ends_at > start,
+            Booking.booked_at < end,
+        )
+        .group_by(Booking.car_id)
+        .subquery()
+    )
+
+    rows = (
+        db.session.query(
+            Car.car_id,
+            func.coalesce(booked_days.c.booked_days, 0).label("booked_days"),
+            func.coalesce(booked_days.c.bookings, 0).label("bookings"),
+        )
+        .outerjoin(booked_days, booked_days.c.car_id == Car.car_id)
+        .order_by(Car.car_id)
+        .all()
+    )
+
+    resp_data = [
+        {
+            "car_id": row.car_id,
+            "bookings": row.bookings,
+            "booked_days": round(row.booked_days, 4),
+            "utilisation": round(row.booked_days / period_days, 4) if period_days else 0.0,
+        }
+        for row in rows
+    ]
+
+    return {
+        "status": "success",
+        "message": "Utilisation retrieved successfully",
+        "data": resp_data,
+    }, HTTP_200_OK
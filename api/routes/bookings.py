@@ -1,21 +1,46 @@
-from flask import Blueprint, request, make_response
+from flask import Blueprint, request, make_response, g
+from datetime import datetime
 from ..database import db
 from ..models import Booking, Customer, Car
+from sqlalchemy.orm import joinedload, load_only
 from flask_jwt_extended import jwt_required
 from ..utils.http_status_codes import *
-from ..utils.helpers import generate_booking_id, validate_request, validate_response
+from ..utils.helpers import generate_booking_id, validate_request, validate_response, paginate, get_projection
+from ..utils.cache import analytics_cache
+from ..utils.export import EXPORT_FORMATS, export_rows
 from ..schemas import BookingCreate, BookingResponse, BookingUpdate
+from ..serializers import serialize, serialize_fields, to_columns
 
 
 booking_bp = Blueprint("booking", __name__, url_prefix="/api/v1/bookings")
 
 
+def has_overlap(car_id, start, end, exclude_booking_id=None):
+    """
+    Check for a non-canceled booking of the car overlapping [start, end).
+    Callers must hold the car row lock so the answer stays true until commit.
+    The check is a locking read so it sees bookings committed after this
+    transaction's snapshot was taken.
+    """
+    query = db.session.query(Booking.booking_id).filter(
+        Booking.car_id == car_id,
+        Booking.status != "canceled",
+        Booking.ends_at > start,
+        Booking.booked_at < end,
+    )
+
+    if exclude_booking_id:
+        query = query.filter(Booking.booking_id != exclude_booking_id)
+
+    return query.with_for_update().first() is not None
+
+
 @booking_bp.post("/")
 @jwt_required()
 @validate_request(request_model=BookingCreate)
 @validate_response(response_model=BookingResponse)
 def add_booking():
-    data = request.get_json()
+    data = g.payload.model_dump()
     customer_id = data["customer_id"]
     car_id = data["car_id"]
 
@@ -27,16 +52,40 @@ def add_booking():
             "data": None
         }, HTTP_404_NOT_FOUND
     
-    car = Car.query.filter_by(car_id=car_id).first()
+    booked_at = data["booked_at"] or datetime.now()
+
+    # Lock the car row so concurrent bookings of the same car are
+    # serialized, bookings of other cars are not affected
+    car = Car.query.filter_by(car_id=car_id).with_for_update().first()
     if not car:
+        db.session.rollback()
         return {
             "status": "error",
             "message": "Car does not exist",
             "data": None
         }, HTTP_404_NOT_FOUND
 
+    if not car.availability_status:
+        db.session.rollback()
+        return {
+            "status": "error",
+            "message": "Car is not available for booking",
+            "data": None
+        }, HTTP_409_CONFLICT
+
     booking_id = generate_booking_id()
     data["booking_id"] = booking_id
+    data["booked_at"] = booked_at
+    data["time_period"] = data.get("time_period") or 1
+    data["ends_at"] = Booking.compute_ends_at(data["booked_at"], data["time_period"])
+
+    if has_overlap(car_id, data["booked_at"], data["ends_at"]):
+        db.session.rollback()
+        return {
+            "status": "error",
+            "message": "Car is already booked for this period",
+            "data": None
+        }, HTTP_409_CONFLICT
 
     booking = Booking(**data)
     db.session.add(booking)
@@ -51,6 +100,8 @@ def add_booking():
             "data": str(e),
         }, HTTP_500_INTERNAL_SERVER_ERROR
 
+    analytics_cache.invalidate("fines", "utilisation")
+
     resp_data = booking.as_dict()
 
     return {
@@ -59,6 +110,32 @@ def add_booking():
         "data": resp_data,
     }, HTTP_201_CREATED
 
+@booking_bp.get("/export")
+@jwt_required()
+def export_bookings():
+    customer_id = request.args.get("customer_id")
+    car_id = request.args.get("car_id")
+    fmt = request.args.get("format", "ndjson")
+
+    if fmt not in EXPORT_FORMATS:
+        return {
+            "status": "error",
+            "message": f"format must be one of {', '.join(EXPORT_FORMATS)}",
+            "data": None,
+        }, HTTP_400_BAD_REQUEST
+
+    fields, _ = get_projection(Booking, "default")
+
+    query = db.session.query(*to_columns(Booking, fields))
+
+    if customer_id:
+        query = query.filter(Booking.customer_id == customer_id)
+    if car_id:
+        query = query.filter(Booking.car_id == car_id)
+
+    return export_rows(query.order_by(Booking.booking_id), fields, fmt, "bookings")
+
+
 @booking_bp.get("/")
 @jwt_required()
 @validate_response(response_model=BookingResponse)
@@ -66,14 +143,21 @@ def get_bookings():
     customer_id = request.args.get("customer_id")
     car_id = request.args.get("car_id")
 
-    query = db.session.query(Booking)
+    view = "by_customer" if customer_id else "default"
+    fields, extras = get_projection(Booking, view, extras=("customer_name", "car"))
+
+    query = db.session.query(Booking).options(load_only(*to_columns(Booking, fields)))
+    if "customer_name" in extras:
+        query = query.options(joinedload(Booking.customer).load_only(Customer.name))
+    if "car" in extras:
+        query = query.options(joinedload(Booking.car))
 
     if customer_id:
         query = query.filter_by(customer_id=customer_id)
     if car_id:
         query = query.filter_by(car_id=car_id)
 
-    bookings = query.all()
+    bookings, next_cursor = paginate(query, Booking.booking_id)
 
     if not bookings:
         return {
@@ -83,17 +167,12 @@ def get_bookings():
         }, HTTP_404_NOT_FOUND
 
     def handle_booking(booking):
-        customer_name = booking.customer.name
-        car = booking.car.as_dict()
-        booking = booking.as_dict()
-
-        if customer_id:
-            del booking["customer_id"]
-
-        del car["car_id"]
-        booking["customer_name"] = customer_name
-        booking["car"] = car
-        return booking
+        resp = serialize_fields(booking, fields)
+        if "customer_name" in extras:
+            resp["customer_name"] = booking.customer.name
+        if "car" in extras:
+            resp["car"] = serialize(booking.car, "nested")
+        return resp
 
     resp_data = [handle_booking(booking) for booking in bookings]
 
@@ -101,6 +180,7 @@ def get_bookings():
         "status": "success",
         "message": f"Found {len(bookings)} bookings",
         "data": resp_data,
+        "next_cursor": next_cursor,
     }, HTTP_200_OK
 
 
@@ -108,7 +188,12 @@ def get_bookings():
 @jwt_required()
 @validate_response(response_model=BookingResponse)
 def get_booking(id):
-    booking = db.session.query(Booking).filter_by(booking_id=id).first()
+    booking = (
+        db.session.query(Booking)
+        .options(joinedload(Booking.customer), joinedload(Booking.car))
+        .filter_by(booking_id=id)
+        .first()
+    )
 
     if not booking:
         return {
@@ -117,12 +202,9 @@ def get_booking(id):
             "data": None,
         }, HTTP_404_NOT_FOUND
 
-    car = booking.car.as_dict()
-    customer_name = booking.customer.name
-    del car["car_id"]
-    resp_data = booking.as_dict()
-    resp_data["customer_name"] = customer_name
-    resp_data["car"] = car
+    resp_data = serialize(booking)
+    resp_data["customer_name"] = booking.customer.name
+    resp_data["car"] = serialize(booking.car, "nested")
     
     return {
         "status": "success",
@@ -153,6 +235,8 @@ def delete_booking(id):
             "data": str(e),
         }, HTTP_500_INTERNAL_SERVER_ERROR
 
+    analytics_cache.invalidate("fines", "utilisation")
+
     return {}, HTTP_204_NO_CONTENT
 
 @booking_bp.put("/<id>")
@@ -173,12 +257,29 @@ def update_booking(id):
     
     customer_id = booking.customer.customer_id
     customer_name = booking.customer.name
-    car = booking.car.as_dict()
-    car_id = car["car_id"]
+    car = serialize(booking.car, "nested")
+    car_id = booking.car_id
 
-    data = request.get_json()
+    data = g.payload.model_dump(exclude_unset=True)
     data["customer_id"] = customer_id
     data["car_id"] = car_id
+    if data.get("time_period"):
+        data["ends_at"] = Booking.compute_ends_at(booking.booked_at, data["time_period"])
+
+    # A longer period or a reactivated (e.g. canceled -> booked) booking
+    # can collide with another booking of the car
+    if data.get("status", booking.status) != "canceled" and ("status" in data or "time_period" in data):
+        ends_at = data.get("ends_at") or Booking.compute_ends_at(booking.booked_at, booking.time_period)
+
+        Car.query.filter_by(car_id=car_id).with_for_update().first()
+        if has_overlap(car_id, booking.booked_at, ends_at, exclude_booking_id=id):
+            db.session.rollback()
+            return {
+                "status": "error",
+                "message": "Car is already booked for this period",
+                "data": None,
+            }, HTTP_409_CONFLICT
+
     updated_booking= booking_query.update(data, synchronize_session=False)
 
     try:
@@ -191,7 +292,8 @@ def update_booking(id):
             "data": str(e),
         }, HTTP_500_INTERNAL_SERVER_ERROR
 
-    del car["car_id"]
+    analytics_cache.invalidate("fines", "utilisation")
+
     data["booking_id"] = id
     data["customer_name"] = customer_name
     data["car"] = car
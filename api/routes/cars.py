@@ -1,23 +1,33 @@
-from flask import Blueprint, request, make_response
+from flask import Blueprint, request, make_response, g, current_app
+from typing import List
+from datetime import datetime
 from ..database import db
-from ..models import Car
+from ..models import Car, Booking
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import selectinload, load_only
 from flask_jwt_extended import jwt_required
 from ..utils.http_status_codes import *
-from ..utils.helpers import validate_request, validate_response, generate_car_id
-from ..schemas import CarCreate, CarResponse
+from ..utils.helpers import validate_request, validate_response, generate_car_id, paginate, get_projection, role_based, bulk_response
+from ..schemas import BulkResponse, CarCreate, CarResponse
+from ..utils.cache import catalogue_cache, cached_response
+from ..serializers import serialize, serialize_fields, to_columns
 from pydantic import ValidationError
 
 car_bp = Blueprint("car", __name__, url_prefix="/api/v1/cars")
 
-def updateService(service):
-    del service["car_id"]
-    return service
+def handleCar(car, fields=None, with_services=True):
+    resp = serialize(car) if fields is None else serialize_fields(car, fields)
+    if with_services:
+        resp["services"] = [serialize(service, "nested") for service in car.services]
+
+    return resp
 
 @car_bp.post("/")
 @validate_request(request_model=CarCreate)
 @validate_response(response_model=CarResponse)
 def create_car():
-    data = request.get_json()
+    data = g.payload.model_dump()
     car_id = generate_car_id()
     data["car_id"] = car_id
 
@@ -43,6 +53,8 @@ def create_car():
             "message": "Internal server error",
             "data": str(e),
         }, HTTP_500_INTERNAL_SERVER_ERROR
+
+    catalogue_cache.invalidate("cars")
     
     resp_data = {
         "car_id": car_id,
@@ -57,10 +69,93 @@ def create_car():
         "data": resp_data,
     }, HTTP_201_CREATED
 
+@car_bp.post("/bulk")
+@jwt_required()
+@role_based()
+@validate_request(request_model=List[CarCreate])
+@validate_response(response_model=BulkResponse)
+def create_cars():
+    items = [car.model_dump() for car in g.payload]
+
+    max_items = current_app.config["BULK_MAX_ITEMS"]
+    if not items or len(items) > max_items:
+        return {
+            "status": "error",
+            "message": f"Expected between 1 and {max_items} items",
+            "data": None,
+        }, HTTP_400_BAD_REQUEST
+
+    license_nos = {item["license_no"] for item in items}
+    taken = {
+        license_no
+        for (license_no,) in db.session.query(Car.license_no).filter(Car.license_no.in_(license_nos))
+    }
+
+    results, rows, indexes = [], [], {}
+    for index, item in enumerate(items):
+        if item["license_no"] in taken:
+            results.append({"index": index, "status": "error", "message": "Car already exist"})
+            continue
+
+        taken.add(item["license_no"])
+        item["car_id"] = generate_car_id()
+        rows.append(item)
+        indexes[item["license_no"]] = index
+        results.append({"index": index, "status": "success", "id": item["car_id"]})
+
+    while rows:
+        try:
+            db.session.execute(insert(Car), rows)
+            db.session.commit()
+            break
+        except IntegrityError as e:
+            db.session.rollback()
+            error = e
+        except Exception as e:
+            db.session.rollback()
+            return {
+                "status": "error",
+                "message": "Internal server error",
+                "data": str(e),
+            }, HTTP_500_INTERNAL_SERVER_ERROR
+
+        # A concurrent request took some of the license numbers after the
+        # check above, report those items and insert the rest
+        taken = {
+            license_no
+            for (license_no,) in db.session.query(Car.license_no).filter(
+                Car.license_no.in_([row["license_no"] for row in rows])
+            )
+        }
+        if not taken:
+            return {
+                "status": "error",
+                "message": "Internal server error",
+                "data": str(error),
+            }, HTTP_500_INTERNAL_SERVER_ERROR
+
+        for license_no in taken:
+            index = indexes[license_no]
+            results[index] = {"index": index, "status": "error", "message": "Car already exist"}
+        rows = [row for row in rows if row["license_no"] not in taken]
+
+    if rows:
+        catalogue_cache.invalidate("cars")
+
+    return bulk_response(results, "cars")
+
 @car_bp.get("/")
+@cached_response(catalogue_cache, tags=lambda: ("cars",))
 @validate_response(response_model=CarResponse)
 def get_cars():
-    cars = db.session.query(Car).all()
+    fields, extras = get_projection(Car, extras=("services",))
+    with_services = "services" in extras
+
+    query = db.session.query(Car).options(load_only(*to_columns(Car, fields)))
+    if with_services:
+        query = query.options(selectinload(Car.services))
+
+    cars, next_cursor = paginate(query, Car.car_id)
 
     if not cars:
         return {
@@ -68,27 +163,96 @@ def get_cars():
             "message": "No cars registered",
             "data": [],
         }, HTTP_404_NOT_FOUND
-    
-    def handleCar(car):
-        services = [updateService(service.as_dict()) for service in car.services]
-        car = car.as_dict()
-        car["services"] = services
 
-        return car 
+    resp_data = [handleCar(car, fields, with_services) for car in cars]
+
+    return {
+        "status": "success",
+        "message": f"{len(resp_data)} cars found",
+        "data": resp_data,
+        "next_cursor": next_cursor,
+    }, HTTP_200_OK
+
+
+@car_bp.get("/availability")
+@validate_response(response_model=CarResponse)
+def get_available_cars():
+    try:
+        start = datetime.fromisoformat(request.args["start"])
+        end = datetime.fromisoformat(request.args["end"])
+    except (KeyError, ValueError):
+        return {
+            "status": "error",
+            "message": "start and end must be ISO 8601 dates",
+            "data": None,
+        }, HTTP_400_BAD_REQUEST
+
+    if end <= start:
+        return {
+            "status": "error",
+            "message": "end must be after start",
+            "data": None,
+        }, HTTP_400_BAD_REQUEST
+
+    # Uses ix_bookings_car_id_ends_at: only bookings ending after `start`
+    # are visited, however long the booking history is
+    overlapping = (
+        db.session.query(Booking.booking_id)
+        .filter(
+            Booking.car_id == Car.car_id,
+            Booking.status != "canceled",
+            Booking.ends_at > start,
+            Booking.booked_at < end,
+        )
+        .exists()
+    )
+
+    query = (
+        db.session.query(Car)
+        .options(selectinload(Car.services))
+        .filter(Car.availability_status.is_(True), ~overlapping)
+    )
+
+    seats = request.args.get("seats", type=int)
+    fuel = request.args.get("fuel")
+    transmission = request.args.get("transmission")
+
+    if seats:
+        query = query.filter(Car.seats >= seats)
+    if fuel:
+        query = query.filter_by(fuel=fuel)
+    if transmission:
+        query = query.filter_by(transmission=transmission)
+
+    cars, next_cursor = paginate(query, Car.car_id)
+
+    if not cars:
+        return {
+            "status": "error",
+            "message": "No cars available for the selected period",
+            "data": [],
+        }, HTTP_404_NOT_FOUND
 
     resp_data = [handleCar(car) for car in cars]
 
     return {
         "status": "success",
-        "message": f"{len(resp_data)} cars found",
+        "message": f"{len(resp_data)} cars available",
         "data": resp_data,
+        "next_cursor": next_cursor,
     }, HTTP_200_OK
 
 
 @car_bp.get("/<id>")
+@cached_response(catalogue_cache, tags=lambda id: (f"car:{id}",))
 @validate_response(response_model=CarResponse)
 def get_car(id):
-    car = db.session.query(Car).filter_by(car_id=id).first()
+    car = (
+        db.session.query(Car)
+        .options(selectinload(Car.services))
+        .filter_by(car_id=id)
+        .first()
+    )
 
     if not car:
         return {
@@ -96,13 +260,8 @@ def get_car(id):
             "message": "Car does not exist",
             "data": None,
         }, HTTP_404_NOT_FOUND
-    
-    services = [updateService(service.as_dict()) for service in car.services]
-    car = car.as_dict()
-    car["services"] = services
 
-    
-    resp_data = car
+    resp_data = handleCar(car)
 
     return {
         "status": "success",
@@ -135,6 +294,7 @@ def delete_car(id):
             "data": str(e),
         }, HTTP_500_INTERNAL_SERVER_ERROR
 
+    catalogue_cache.invalidate("cars", f"car:{id}")
     return {}, HTTP_204_NO_CONTENT
 
 
@@ -152,7 +312,7 @@ def update_car(id):
             "data": None
         }, HTTP_404_NOT_FOUND
     
-    data = request.get_json()
+    data = g.payload.model_dump(exclude_unset=True)
     updated_car = car_query.update(data, synchronize_session=False)
 
     try:
@@ -164,6 +324,8 @@ def update_car(id):
             "message": "Internal server error",
             "data": str(e),
         }, HTTP_500_INTERNAL_SERVER_ERROR
+
+    catalogue_cache.invalidate("cars", f"car:{id}")
     
     data['car_id'] = id
     resp_data = data
@@ -1,10 +1,12 @@
-from flask import Blueprint, request
+from flask import Blueprint, request, g
 from ..database import db
-from ..models import User
+from ..models import User, Customer
+from sqlalchemy.orm import joinedload, load_only
 from flask_jwt_extended import jwt_required
 from ..utils.http_status_codes import *
-from ..utils.helpers import validate_request, validate_response
+from ..utils.helpers import validate_request, validate_response, paginate, get_projection
 from ..schemas import CustomerCreate, CustomerResponse
+from ..serializers import get_columns, serialize, serialize_fields, to_columns
 
 customer_bp = Blueprint("customer", __name__, url_prefix="/api/v1/customers")
 
@@ -13,7 +15,18 @@ customer_bp = Blueprint("customer", __name__, url_prefix="/api/v1/customers")
 @jwt_required()
 @validate_response(response_model=CustomerResponse)
 def get_customers():
-    users = db.session.query(User).filter_by(role="customer").all()
+    fields, extras = get_projection(Customer, "nested", extras=("user",))
+
+    # The password hash is never needed here, so it is never loaded
+    query = (
+        db.session.query(User)
+        .options(
+            load_only(*get_columns(User, "public")),
+            joinedload(User.customer).load_only(Customer.customer_id, *to_columns(Customer, fields)),
+        )
+        .filter_by(role="customer")
+    )
+    users, next_cursor = paginate(query, User.u_id)
 
     if not users:
         return {
@@ -23,13 +36,9 @@ def get_customers():
         }, HTTP_404_NOT_FOUND
 
     def handleUser(user):
-        customer = user.customer.as_dict()
-        user = user.as_dict()
-
-        del customer["customer_id"]
-        del user["password"]
-
-        customer["user"] = user
+        customer = serialize_fields(user.customer, fields)
+        if "user" in extras:
+            customer["user"] = serialize(user, "public")
 
         return customer
 
@@ -39,6 +48,7 @@ def get_customers():
         "status": "success",
         "message": f"{len(resp_data)} customers found",
         "data": resp_data,
+        "next_cursor": next_cursor,
     }, HTTP_200_OK
 
 
@@ -46,7 +56,12 @@ def get_customers():
 @jwt_required()
 @validate_response(response_model=CustomerResponse)
 def get_customer(id):
-    user = db.session.query(User).filter_by(u_id=id).first()
+    user = (
+        db.session.query(User)
+        .options(joinedload(User.customer))
+        .filter_by(u_id=id)
+        .first()
+    )
 
     if not user or user.role != "customer":
         return {
@@ -55,10 +70,8 @@ def get_customer(id):
             "data": None,
         }, HTTP_404_NOT_FOUND
 
-    customer = user.customer.as_dict()
-    user = user.as_dict()
-    del customer["customer_id"]
-    del user["password"]
+    customer = serialize(user.customer, "nested")
+    user = serialize(user, "public")
 
     customer["user"] = user
     resp_data = customer
@@ -84,8 +97,8 @@ def update_customer(id):
             "data": None,
         }, HTTP_404_NOT_FOUND
 
-    data = request.get_json()
-    image_ = data["image"] if "image" in data else None
+    data = g.payload.model_dump()
+    image_ = data["image"]
 
     customer_ = user.customer
     customer_.address = data["address"]
@@ -105,11 +118,8 @@ def update_customer(id):
             "data": str(e),
         }, HTTP_500_INTERNAL_SERVER_ERROR
 
-    customer = user.customer.as_dict()
-    user = user.as_dict()
-
-    del customer["customer_id"]
-    del user["password"]
+    customer = serialize(user.customer, "nested")
+    user = serialize(user, "public")
 
     customer["user"] = user
     resp_data = customer
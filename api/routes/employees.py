@@ -1,10 +1,12 @@
-from flask import Blueprint, request, make_response
+from flask import Blueprint, request, make_response, g
 from ..database import db
 from ..models import User
+from sqlalchemy.orm import joinedload
 from flask_jwt_extended import jwt_required
 from ..utils.http_status_codes import *
-from ..utils.helpers import validate_request, validate_response
+from ..utils.helpers import validate_request, validate_response, paginate
 from ..schemas import EmployeeCreate, EmployeeResponse
+from ..serializers import serialize
 
 
 employee_bp = Blueprint("employee", __name__, url_prefix="/api/v1/employees")
@@ -13,7 +15,12 @@ employee_bp = Blueprint("employee", __name__, url_prefix="/api/v1/employees")
 @jwt_required()
 @validate_response(response_model=EmployeeResponse)
 def get_employees():
-    users = db.session.query(User).filter_by(role="employee").all()
+    query = (
+        db.session.query(User)
+        .options(joinedload(User.employee))
+        .filter_by(role="employee")
+    )
+    users, next_cursor = paginate(query, User.u_id)
 
     if not users:
         return {
@@ -23,11 +30,8 @@ def get_employees():
         }, HTTP_404_NOT_FOUND
     
     def handleUser(user):
-        employee = user.employee.as_dict()
-        user = user.as_dict()
-
-        del employee["employee_id"]
-        del user["password"]
+        employee = serialize(user.employee, "nested")
+        user = serialize(user, "public")
 
         employee["user"] = user
 
@@ -38,14 +42,20 @@ def get_employees():
     return {
         "status": "success",
         "message": f"{len(resp_data)} employees found",
-        "data": resp_data
+        "data": resp_data,
+        "next_cursor": next_cursor
     }, HTTP_200_OK
 
 @employee_bp.get("/<id>")
 @jwt_required()
 @validate_response(response_model=EmployeeResponse)
 def get_employee(id):
-    user = db.session.query(User).filter_by(u_id=id).first()
+    user = (
+        db.session.query(User)
+        .options(joinedload(User.employee))
+        .filter_by(u_id=id)
+        .first()
+    )
 
     if not user:
         return {
@@ -54,10 +64,8 @@ def get_employee(id):
             "data": None
         }, HTTP_404_NOT_FOUND
     
-    employee = user.employee.as_dict()
-    user = user.as_dict()
-    del employee["employee_id"]
-    del user["password"]
+    employee = serialize(user.employee, "nested")
+    user = serialize(user, "public")
 
     employee["user"] = user
     resp_data = employee
@@ -82,8 +90,8 @@ def update_employee(id):
             "data": None
         }, HTTP_404_NOT_FOUND
 
-    data = request.get_json()
-    image_ = data["image"] if "image" in data else None
+    data = g.payload.model_dump()
+    image_ = data["image"]
 
     employee_ = user.employee
     employee_.address = data["address"]
@@ -103,11 +111,8 @@ def update_employee(id):
             "data": str(e)
         }, HTTP_500_INTERNAL_SERVER_ERROR
 
-    employee = user.employee.as_dict()
-    user = user.as_dict()
-
-    del employee["employee_id"]
-    del user["password"]
+    employee = serialize(user.employee, "nested")
+    user = serialize(user, "public")
     
     employee["user"] = user
     resp_data = employee
@@ -0,0 +1,30 @@
+from flask import Blueprint
+from flask_jwt_extended import jwt_required
+from ..utils.http_status_codes import *
+from ..utils.helpers import role_based
+from ..utils.hashing import hashing_pool
+from ..utils.db_metrics import pool_metrics
+
+metrics_bp = Blueprint("metrics", __name__, url_prefix="/api/v1/metrics")
+
+
+@metrics_bp.get("/hashing")
+@jwt_required()
+@role_based()
+def get_hashing_metrics():
+    return {
+        "status": "success",
+        "message": "Hashing pool metrics retrieved successfully",
+        "data": hashing_pool.metrics(),
+    }, HTTP_200_OK
+
+
+@metrics_bp.get("/db-pool")
+@jwt_required()
+@role_based()
+def get_db_pool_metrics():
+    return {
+        "status": "success",
+        "message": "Database pool metrics retrieved successfully",
+        "data": pool_metrics.snapshot(),
+    }, HTTP_200_OK
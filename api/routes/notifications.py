@@ -1,20 +1,36 @@
-from flask import Blueprint, request, make_response
+from flask import Blueprint, Response, request, make_response, g, current_app, abort
+import queue
+from typing import List
+from datetime import datetime
+from sqlalchemy import insert
 from ..database import db
 from ..models import Notification, User
-from flask_jwt_extended import jwt_required
+from flask_jwt_extended import jwt_required, get_jwt_identity
 from ..utils.http_status_codes import *
-from ..utils.helpers import generate_notification_id, validate_request, validate_response
-from ..schemas import NotificationCreate, NotificationResponse, NotificationUpdate
+from ..utils.helpers import generate_notification_id, validate_request, validate_response, paginate, bulk_response, role_based
+from ..utils.jobs import job_registry
+from ..utils.pubsub import broker
+from ..schemas import BulkResponse, JobResponse, NotificationBroadcast, NotificationCreate, NotificationResponse, NotificationUpdate
+from ..serializers import get_columns, get_fields, serialize_rows
 
 notification_bp = Blueprint("notification", __name__, url_prefix="/api/v1/notifications")
 
 
+def publish_notification(event, notification):
+    """
+    Push a notification event to the streams of its user, as a ready to
+    send SSE frame.
+    """
+    data = current_app.json.dumps(notification)
+    broker.publish(f"user:{notification['u_id']}", f"event: {event}\ndata: {data}\n\n")
+
+
 @notification_bp.post("/")
 @jwt_required()
 @validate_request(request_model=NotificationCreate)
 @validate_response(response_model=NotificationResponse)
 def add_notification():
-    data = request.get_json()
+    data = g.payload.model_dump()
     u_id = data["u_id"]
 
     user = User.query.filter_by(u_id=u_id).first()
@@ -42,6 +58,7 @@ def add_notification():
         }, HTTP_500_INTERNAL_SERVER_ERROR
 
     resp_data = notification.as_dict()
+    publish_notification("notification.created", resp_data)
 
     return {
         "status": "success",
@@ -50,15 +67,157 @@ def add_notification():
     }, HTTP_201_CREATED
 
 
+@notification_bp.post("/bulk")
+@jwt_required()
+@validate_request(request_model=List[NotificationCreate])
+@validate_response(response_model=BulkResponse)
+def add_notifications():
+    items = [notification.model_dump() for notification in g.payload]
+
+    max_items = current_app.config["BULK_MAX_ITEMS"]
+    if not items or len(items) > max_items:
+        return {
+            "status": "error",
+            "message": f"Expected between 1 and {max_items} items",
+            "data": None,
+        }, HTTP_400_BAD_REQUEST
+
+    u_ids = {item["u_id"] for item in items}
+    existing = {u_id for (u_id,) in db.session.query(User.u_id).filter(User.u_id.in_(u_ids))}
+
+    results, rows = [], []
+    for index, item in enumerate(items):
+        if item["u_id"] not in existing:
+            results.append({"index": index, "status": "error", "message": "User does not exist"})
+            continue
+
+        item["notification_id"] = generate_notification_id()
+        item["created_at"] = datetime.now()
+        rows.append(item)
+        results.append({"index": index, "status": "success", "id": item["notification_id"]})
+
+    if not rows:
+        return bulk_response(results, "notifications")
+
+    try:
+        db.session.execute(insert(Notification), rows)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        return {
+            "status": "error",
+            "message": "Internal server error",
+            "data": str(e),
+        }, HTTP_500_INTERNAL_SERVER_ERROR
+
+    for row in rows:
+        publish_notification("notification.created", row)
+
+    return bulk_response(results, "notifications")
+
+
+@job_registry.register("broadcast-notifications")
+def broadcast_notifications(progress, cursor, text, role, chunk_size):
+    """
+    Notify every user with `role` (every user when None), walking the
+    users by primary key after `cursor`, the last one already notified.
+    Each chunk is committed together with the job's cursor, so a resumed
+    broadcast neither skips nor repeats a user.
+    """
+    users = db.session.query(User.u_id)
+    if role:
+        users = users.filter(User.role == role)
+
+    if cursor is None:
+        progress(0, total=users.count())
+
+    last_id = cursor
+    while True:
+        query = users if last_id is None else users.filter(User.u_id > last_id)
+        u_ids = [u_id for (u_id,) in query.order_by(User.u_id).limit(chunk_size)]
+        if not u_ids:
+            break
+
+        created_at = datetime.now()
+        rows = [
+            {"notification_id": generate_notification_id(), "u_id": u_id, "text": text, "created_at": created_at}
+            for u_id in u_ids
+        ]
+        last_id = u_ids[-1]
+        db.session.execute(insert(Notification), rows)
+        progress(len(u_ids), cursor=last_id)
+        db.session.commit()
+
+        for row in rows:
+            publish_notification("notification.created", row)
+
+
+@notification_bp.post("/broadcast")
+@jwt_required()
+@role_based()
+@validate_request(request_model=NotificationBroadcast)
+@validate_response(response_model=JobResponse)
+def broadcast_notification():
+    data = g.payload.model_dump()
+
+    job = job_registry.start(
+        current_app._get_current_object(),
+        "broadcast-notifications",
+        text=data["text"],
+        role=data["role"],
+        chunk_size=current_app.config["BROADCAST_CHUNK_SIZE"],
+    )
+
+    return {
+        "status": "success",
+        "message": "Broadcast started",
+        "data": job,
+    }, HTTP_202_ACCEPTED
+
+
+@notification_bp.get("/broadcast/<job_id>")
+@jwt_required()
+@role_based()
+@validate_response(response_model=JobResponse)
+def get_broadcast(job_id):
+    job = job_registry.get(job_id)
+
+    if not job:
+        return {
+            "status": "error",
+            "message": "Broadcast not found",
+            "data": None,
+        }, HTTP_404_NOT_FOUND
+
+    return {
+        "status": "success",
+        "message": "Broadcast retrieved successfully",
+        "data": job,
+    }, HTTP_200_OK
+
+
 @notification_bp.get("/")
 @validate_response(response_model=NotificationResponse)
 def get_notifications():
     user_id = request.args.get("user_id")
+    since = request.args.get("since")
+
+    query = db.session.query(*get_columns(Notification))
 
     if user_id:
-        notifications = db.session.query(Notification).filter_by(u_id=user_id).all()
-    else:
-        notifications = db.session.query(Notification).all()
+        query = query.filter(Notification.u_id == user_id)
+
+    # Only what was created or changed after `since`, for reconnecting clients.
+    # updated_at is set on insert as well
+    if since:
+        try:
+            since = datetime.fromisoformat(since)
+        except ValueError:
+            abort(HTTP_400_BAD_REQUEST, description="Invalid since")
+
+        query = query.filter(Notification.updated_at > since)
+
+    notifications, next_cursor = paginate(query, Notification.notification_id)
 
     if not notifications:
         return {
@@ -68,15 +227,45 @@ def get_notifications():
     }, HTTP_404_NOT_FOUND
 
 
-    resp_data = [notification.as_dict() for notification in notifications]
+    resp_data = serialize_rows(notifications, get_fields(Notification))
 
     return {
         "status": "success",
         "message": f"{len(resp_data)} notifications found",
         "data": resp_data,
+        "next_cursor": next_cursor,
     }, HTTP_200_OK
 
 
+@notification_bp.get("/stream")
+@jwt_required()
+def stream_notifications():
+    """
+    Server-Sent Events stream of the caller's notification events. After a
+    reconnect, fetch what was missed with GET /?user_id=...&since=...
+    """
+    channel = f"user:{get_jwt_identity()}"
+    keepalive = current_app.config["SSE_KEEPALIVE"]
+
+    def stream():
+        subscriber = broker.subscribe(channel)
+        try:
+            yield "retry: 3000\n\n"
+            while True:
+                try:
+                    yield subscriber.get(timeout=keepalive)
+                except queue.Empty:
+                    yield ": keepalive\n\n"
+        finally:
+            broker.unsubscribe(channel, subscriber)
+
+    return Response(
+        stream(),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @notification_bp.get("/<id>")
 @validate_response(response_model=NotificationResponse)
 def get_notification(id):
@@ -109,6 +298,7 @@ def delete_notification(id):
             "data": None,
         }, HTTP_404_NOT_FOUND
 
+    u_id = notification.u_id
     db.session.delete(notification)
 
     try:
@@ -121,6 +311,7 @@ def delete_notification(id):
             "data": str(e),
         }, HTTP_500_INTERNAL_SERVER_ERROR
 
+    publish_notification("notification.deleted", {"notification_id": id, "u_id": u_id})
     return {}, HTTP_204_NO_CONTENT
 
 
@@ -141,7 +332,7 @@ def update_notification(id):
         }, HTTP_404_NOT_FOUND
     
     u_id = notification.user.u_id
-    data = request.get_json()
+    data = g.payload.model_dump(exclude_unset=True)
     data["u_id"] = u_id
     updated_notification = notification_query.update(data, synchronize_session=False)
 
@@ -157,6 +348,7 @@ def update_notification(id):
 
     data["notification_id"] = id
     resp_data = data
+    publish_notification("notification.updated", resp_data)
 
     return {
         "status": "success",
@@ -1,10 +1,12 @@
-from flask import Blueprint, request, make_response
+from flask import Blueprint, request, make_response, g
 from ..database import db
 from ..models import Review, Customer
+from sqlalchemy.orm import joinedload, load_only
 from flask_jwt_extended import jwt_required
 from ..utils.http_status_codes import *
-from ..utils.helpers import generate_review_id, validate_request, validate_response
+from ..utils.helpers import generate_review_id, validate_request, validate_response, paginate, get_projection
 from ..schemas import ReviewCreate, ReviewResponse, ReviewUpdate
+from ..serializers import serialize_fields, to_columns
 
 review_bp = Blueprint("review", __name__, url_prefix="/api/v1/reviews")
 
@@ -14,7 +16,7 @@ review_bp = Blueprint("review", __name__, url_prefix="/api/v1/reviews")
 @validate_request(request_model=ReviewCreate)
 @validate_response(response_model=ReviewResponse)
 def add_review():
-    data = request.get_json()
+    data = g.payload.model_dump()
     customer_id = data["customer_id"]
 
     customer = Customer.query.filter_by(customer_id=customer_id).first()
@@ -55,10 +57,17 @@ def add_review():
 def get_reviews():
     customer_id = request.args.get("customer_id")
 
+    view = "by_customer" if customer_id else "default"
+    fields, extras = get_projection(Review, view, extras=("customer_name",))
+
+    query = db.session.query(Review).options(load_only(*to_columns(Review, fields)))
+    if "customer_name" in extras:
+        query = query.options(joinedload(Review.customer).load_only(Customer.name))
+
     if customer_id:
-        reviews = db.session.query(Review).filter_by(customer_id=customer_id).all()
-    else:
-        reviews = db.session.query(Review).all()
+        query = query.filter_by(customer_id=customer_id)
+
+    reviews, next_cursor = paginate(query, Review.review_id)
 
     if not reviews:
         return {
@@ -68,13 +77,10 @@ def get_reviews():
     }, HTTP_404_NOT_FOUND
 
     def handleReview(review):
-        customer_name = review.customer.name
-        # print(review.customer)
-        review = review.as_dict()
-        review["customer_name"] = customer_name
-        if customer_id:
-            del review["customer_id"]
-        return review
+        resp = serialize_fields(review, fields)
+        if "customer_name" in extras:
+            resp["customer_name"] = review.customer.name
+        return resp
 
 
     resp_data = [handleReview(review) for review in reviews]
@@ -83,13 +89,19 @@ def get_reviews():
         "status": "success",
         "message": f"{len(resp_data)} reviews found",
         "data": resp_data,
+        "next_cursor": next_cursor,
     }, HTTP_200_OK
 
 
 @review_bp.get("/<id>")
 @validate_response(response_model=ReviewResponse)
 def get_review(id):
-    review = db.session.query(Review).filter_by(review_id=id).first()
+    review = (
+        db.session.query(Review)
+        .options(joinedload(Review.customer))
+        .filter_by(review_id=id)
+        .first()
+    )
 
     if not review:
         return {
@@ -153,7 +165,7 @@ def update_review(id):
         }, HTTP_404_NOT_FOUND
     
     customer_id = review.customer.customer_id
-    data = request.get_json()
+    data = g.payload.model_dump(exclude_unset=True)
     data["customer_id"] = customer_id
     updated_review = review_query.update(data, synchronize_session=False)
 
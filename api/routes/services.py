@@ -1,10 +1,14 @@
-from flask import Blueprint, request, make_response
+from flask import Blueprint, request, make_response, g, current_app
+from typing import List
+from sqlalchemy import insert
 from ..database import db
 from ..models import Service, Car
 from flask_jwt_extended import jwt_required
 from ..utils.http_status_codes import *
-from ..utils.helpers import generate_service_id, validate_request, validate_response, role_based
-from ..schemas import ServiceCreate, ServiceResponse, ServiceUpdate
+from ..utils.helpers import generate_service_id, validate_request, validate_response, role_based, paginate, bulk_response
+from ..schemas import BulkResponse, ServiceCreate, ServiceResponse, ServiceUpdate
+from ..utils.cache import analytics_cache, catalogue_cache
+from ..serializers import get_columns, get_fields, serialize_rows
 
 service_bp = Blueprint("service", __name__, url_prefix="/api/v1/services")
 
@@ -15,7 +19,7 @@ service_bp = Blueprint("service", __name__, url_prefix="/api/v1/services")
 @validate_request(request_model=ServiceCreate)
 @validate_response(response_model=ServiceResponse)
 def add_service():
-    data = request.get_json()
+    data = g.payload.model_dump()
     car_id = data["car_id"]
 
     car = Car.query.filter_by(car_id=car_id).first()
@@ -42,6 +46,8 @@ def add_service():
             "data": str(e),
         }, HTTP_500_INTERNAL_SERVER_ERROR
 
+    catalogue_cache.invalidate("cars", f"car:{car_id}")
+    analytics_cache.invalidate("service-costs")
     resp_data = service.as_dict()
 
     return {
@@ -51,10 +57,62 @@ def add_service():
     }, HTTP_201_CREATED
 
 
+@service_bp.post("/bulk")
+@jwt_required()
+@role_based()
+@validate_request(request_model=List[ServiceCreate])
+@validate_response(response_model=BulkResponse)
+def add_services():
+    items = [service.model_dump() for service in g.payload]
+
+    max_items = current_app.config["BULK_MAX_ITEMS"]
+    if not items or len(items) > max_items:
+        return {
+            "status": "error",
+            "message": f"Expected between 1 and {max_items} items",
+            "data": None,
+        }, HTTP_400_BAD_REQUEST
+
+    car_ids = {item["car_id"] for item in items}
+    existing = {
+        car_id for (car_id,) in db.session.query(Car.car_id).filter(Car.car_id.in_(car_ids))
+    }
+
+    results, rows = [], []
+    for index, item in enumerate(items):
+        if item["car_id"] not in existing:
+            results.append({"index": index, "status": "error", "message": "Car does not exist"})
+            continue
+
+        item["service_id"] = generate_service_id()
+        rows.append(item)
+        results.append({"index": index, "status": "success", "id": item["service_id"]})
+
+    if not rows:
+        return bulk_response(results, "services")
+
+    try:
+        db.session.execute(insert(Service), rows)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        return {
+            "status": "error",
+            "message": "Internal server error",
+            "data": str(e),
+        }, HTTP_500_INTERNAL_SERVER_ERROR
+
+    catalogue_cache.invalidate("cars", *{f"car:{row['car_id']}" for row in rows})
+    analytics_cache.invalidate("service-costs")
+
+    return bulk_response(results, "services")
+
+
 @service_bp.get("/")
 @validate_response(response_model=ServiceResponse)
 def get_services():
-    services = db.session.query(Service).all()
+    query = db.session.query(*get_columns(Service))
+    services, next_cursor = paginate(query, Service.service_id)
 
     if not services:
         return {
@@ -63,12 +121,13 @@ def get_services():
             "data": [],
         }, HTTP_404_NOT_FOUND
 
-    resp_data = [service.as_dict() for service in services]
+    resp_data = serialize_rows(services, get_fields(Service))
 
     return {
         "status": "success",
         "message": f"{len(resp_data)} Services found",
         "data": resp_data,
+        "next_cursor": next_cursor,
     }, HTTP_200_OK
 
 
@@ -105,6 +164,7 @@ def delete_service(id):
             "data": None,
         }, HTTP_404_NOT_FOUND
 
+    car_id = service.car_id
     db.session.delete(service)
 
     try:
@@ -117,6 +177,8 @@ def delete_service(id):
             "data": str(e),
         }, HTTP_500_INTERNAL_SERVER_ERROR
 
+    catalogue_cache.invalidate("cars", f"car:{car_id}")
+    analytics_cache.invalidate("service-costs")
     return {}, HTTP_204_NO_CONTENT
 
 
@@ -137,7 +199,7 @@ def update_service(id):
         }, HTTP_404_NOT_FOUND
     
     car_id = service.car.car_id
-    data = request.get_json()
+    data = g.payload.model_dump(exclude_unset=True)
     data["car_id"] = car_id
     updated_service = service_query.update(data, synchronize_session=False)
 
@@ -151,6 +213,8 @@ def update_service(id):
             "data": str(e),
         }, HTTP_500_INTERNAL_SERVER_ERROR
 
+    catalogue_cache.invalidate("cars", f"car:{car_id}")
+    analytics_cache.invalidate("service-costs")
     data["service_id"] = id
     resp_data = data
 
@@ -0,0 +1,69 @@
+from flask import Blueprint, request, current_app
+from datetime import datetime, timedelta
+from sqlalchemy import or_
+from ..database import db
+from ..models import Booking, Car, Notification, Tombstone
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from ..utils.http_status_codes import *
+from ..utils.helpers import validate_response
+from ..utils.sync import decode_sync_token, encode_sync_token
+from ..schemas import SyncResponse
+from ..serializers import get_columns, get_fields, serialize_rows
+
+sync_bp = Blueprint("sync", __name__, url_prefix="/api/v1/sync")
+
+
+def changed_rows(model, since, *filters):
+    query = db.session.query(*get_columns(model)).filter(*filters)
+    if since:
+        query = query.filter(model.updated_at >= since)
+
+    return serialize_rows(query.all(), get_fields(model))
+
+
+@sync_bp.get("/")
+@jwt_required()
+@validate_response(response_model=SyncResponse)
+def sync():
+    """
+    Cars, the caller's bookings and notifications changed since the `since`
+    token, plus the ids deleted since then. Without a token everything in
+    scope is returned. Pass the returned token on the next call.
+    """
+    user_id = get_jwt_identity()
+    token = request.args.get("since")
+
+    # Read the clock before the queries, a change committed while they run
+    # is picked up by the next sync. The overlap also covers transactions
+    # that commit after their updated_at was taken and replica lag.
+    started_at = datetime.now()
+    since = None
+    if token:
+        overlap = timedelta(seconds=current_app.config["SYNC_OVERLAP"])
+        since = decode_sync_token(token) - overlap
+
+    resp_data = {
+        "cars": changed_rows(Car, since),
+        "bookings": changed_rows(Booking, since, Booking.customer_id == user_id),
+        "notifications": changed_rows(Notification, since, Notification.u_id == user_id),
+        "deleted": {"cars": [], "bookings": [], "notifications": []},
+        "token": encode_sync_token(started_at),
+    }
+
+    if since:
+        tombstones = (
+            db.session.query(Tombstone.table_name, Tombstone.row_id)
+            .filter(
+                Tombstone.deleted_at >= since,
+                Tombstone.table_name.in_(resp_data["deleted"]),
+                or_(Tombstone.scope_id.is_(None), Tombstone.scope_id == user_id),
+            )
+        )
+        for table_name, row_id in tombstones:
+            resp_data["deleted"][table_name].append(row_id)
+
+    return {
+        "status": "success",
+        "message": "Changes retrieved successfully",
+        "data": resp_data,
+    }, HTTP_200_OK
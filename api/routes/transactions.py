@@ -1,10 +1,13 @@
-from flask import Blueprint, request, make_response
+from flask import Blueprint, request, make_response, g
 from ..database import db
 from ..models import Transaction, Booking, Car, Customer
 from flask_jwt_extended import jwt_required
 from ..utils.http_status_codes import *
-from ..utils.helpers import generate_transaction_id, validate_request, validate_response
+from ..utils.helpers import generate_transaction_id, validate_request, validate_response, paginate, get_projection
+from ..utils.cache import analytics_cache
+from ..utils.export import EXPORT_FORMATS, export_rows
 from ..schemas import TransactionCreate, TransactionResponse, TransactionUpdate
+from ..serializers import to_columns, serialize_rows
 
 
 transaction_bp = Blueprint("transaction", __name__, url_prefix="/api/v1/transactions")
@@ -15,7 +18,7 @@ transaction_bp = Blueprint("transaction", __name__, url_prefix="/api/v1/transact
 @validate_request(request_model=TransactionCreate)
 @validate_response(response_model=TransactionResponse)
 def add_transaction():
-    data = request.get_json()
+    data = g.payload.model_dump()
     booking_id = data["booking_id"]
 
     booking = Booking.query.filter_by(booking_id=booking_id).first()
@@ -47,6 +50,8 @@ def add_transaction():
             "data": str(e),
         }, HTTP_500_INTERNAL_SERVER_ERROR
 
+    analytics_cache.invalidate("revenue")
+
     resp_data = transaction.as_dict()
 
     return {
@@ -55,19 +60,57 @@ def add_transaction():
         "data": resp_data,
     }, HTTP_201_CREATED
 
+@transaction_bp.get("/export")
+@jwt_required()
+def export_transactions():
+    customer_id = request.args.get("customer_id")
+    car_id = request.args.get("car_id")
+    fmt = request.args.get("format", "ndjson")
+
+    if fmt not in EXPORT_FORMATS:
+        return {
+            "status": "error",
+            "message": f"format must be one of {', '.join(EXPORT_FORMATS)}",
+            "data": None,
+        }, HTTP_400_BAD_REQUEST
+
+    fields, _ = get_projection(Transaction, "default")
+
+    query = db.session.query(*to_columns(Transaction, fields))
+
+    if customer_id:
+        query = query.filter(Transaction.customer_id == customer_id)
+    if car_id:
+        query = query.filter(Transaction.car_id == car_id)
+
+    return export_rows(query.order_by(Transaction.transaction_id), fields, fmt, "transactions")
+
+
 @transaction_bp.get("/")
 def get_transactions():
     customer_id = request.args.get("customer_id")
     car_id = request.args.get("car_id")
 
-    query = db.session.query(Transaction)
+    if customer_id and car_id:
+        view = "by_customer_and_car"
+    elif customer_id:
+        view = "by_customer"
+    elif car_id:
+        view = "by_car"
+    else:
+        view = "default"
+
+    fields, _ = get_projection(Transaction, view)
+
+    # Select plain rows, no ORM objects are built for the listing
+    query = db.session.query(*to_columns(Transaction, fields))
 
     if customer_id:
-        query = query.filter_by(customer_id=customer_id)
+        query = query.filter(Transaction.customer_id == customer_id)
     if car_id:
-        query = query.filter_by(car_id=car_id)
+        query = query.filter(Transaction.car_id == car_id)
 
-    transactions = query.all()
+    transactions, next_cursor = paginate(query, Transaction.transaction_id)
 
     if not transactions:
         return {
@@ -76,19 +119,13 @@ def get_transactions():
             "data": [],
         }, HTTP_404_NOT_FOUND
 
-    def handle_transaction(transaction):
-        if customer_id:
-            del transaction["customer_id"]
-        if car_id:
-            del transaction["car_id"]
-        return transaction
-
-    resp_data = [handle_transaction(transaction.as_dict()) for transaction in transactions]
+    resp_data = serialize_rows(transactions, fields)
 
     return {
         "status": "success",
         "message": f"Found {len(transactions)} bookings",
         "data": resp_data,
+        "next_cursor": next_cursor,
     }, HTTP_200_OK
 
 @transaction_bp.get("/<id>")
@@ -134,6 +171,8 @@ def delete_transaction(id):
             "data": str(e),
         }, HTTP_500_INTERNAL_SERVER_ERROR
 
+    analytics_cache.invalidate("revenue")
+
     return {}, HTTP_204_NO_CONTENT
 
 @transaction_bp.put("/<id>")
@@ -154,7 +193,7 @@ def update_transaction(id):
     
     customer_id = transaction.customer_id
     car_id = transaction.car_id
-    data = request.get_json()
+    data = g.payload.model_dump(exclude_unset=True)
     data["customer_id"] = customer_id
     data["car_id"] = car_id
     updated_booking= transaction_query.update(data, synchronize_session=False)
@@ -169,6 +208,8 @@ def update_transaction(id):
             "data": str(e),
         }, HTTP_500_INTERNAL_SERVER_ERROR
 
+    analytics_cache.invalidate("revenue")
+
     data["transaction_id"] = id
     resp_data = data
 
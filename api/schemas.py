@@ -8,6 +8,17 @@ from enum import Enum
 class Response(BaseModel):
     status: Literal["error", "success"]
     message: str
+    next_cursor: Optional[str] = None
+
+
+class BulkItemResult(BaseModel):
+    index: int
+    status: Literal["error", "success"]
+    id: Optional[str] = None
+    message: Optional[str] = None
+
+class BulkResponse(Response):
+    data: List[BulkItemResult] | None | str
 
 
 # ------------------- USER SCHEMAS -------------------
@@ -211,6 +222,7 @@ class BookingBase(BaseModel):
 class BookingCreate(BookingBase):
     customer_id: str
     car_id: str
+    booked_at: Optional[datetime] = None
 
 class BookingUpdate(BookingBase):
     pass
@@ -229,6 +241,43 @@ class BookingDataCreate(BookingBase):
 class BookingResponse(Response):
     data: BookingDataCreate | BookingData | List[BookingData] | None | str
 
+# ------------------- SYNC SCHEMAS -------------------
+class SyncDeleted(BaseModel):
+    cars: List[str]
+    bookings: List[str]
+    notifications: List[str]
+
+class SyncData(BaseModel):
+    cars: List[Dict[str, Any]]
+    bookings: List[Dict[str, Any]]
+    notifications: List[Dict[str, Any]]
+    deleted: SyncDeleted
+    token: str
+
+class SyncResponse(Response):
+    data: SyncData | None | str
+
+
+# ------------------- JOB SCHEMAS -------------------
+class JobData(BaseModel):
+    job_id: str
+    name: str
+    status: Literal["pending", "running", "done", "failed"]
+    total: Optional[int] = None
+    processed: int
+    error: Optional[str] = None
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+
+class JobResponse(Response):
+    data: JobData | None | str
+
+
+# ------------------- ANALYTICS SCHEMAS -------------------
+class AnalyticsResponse(Response):
+    data: List[Dict[str, Any]] | None | str
+
+
 # ------------------- NOTIFICATION SCHEMAS -------------------
 class NotificationBase(BaseModel):
     text: str
@@ -239,6 +288,10 @@ class NotificationCreate(NotificationBase):
 class NotificationUpdate(NotificationBase):
     pass
 
+class NotificationBroadcast(NotificationBase):
+    # Every user when no role is given
+    role: Optional[Literal["admin", "employee", "customer"]] = None
+
 class NotificationData(BaseModel):
     notification_id: str
     created_at: Optional[datetime] = None
@@ -0,0 +1,53 @@
+from operator import attrgetter
+from functools import lru_cache
+
+# (model, view) -> (field names, getter returning the field values as a tuple)
+_registry = {}
+
+
+@lru_cache(maxsize=256)
+def _getter(fields):
+    getter = attrgetter(*fields)
+    if len(fields) == 1:
+        return lambda obj: (getter(obj),)
+    return getter
+
+
+def register(model, view="default", exclude=()):
+    """
+    Precompute the fields of a model view once, at import time.
+    """
+    fields = tuple(c.name for c in model.__table__.columns if c.name not in exclude)
+    _registry[(model, view)] = (fields, _getter(fields))
+
+
+def get_fields(model, view="default"):
+    return _registry[(model, view)][0]
+
+
+def to_columns(model, fields):
+    return [getattr(model, field) for field in fields]
+
+
+def get_columns(model, view="default"):
+    """
+    Column attributes of a view, for selecting rows without hydrating
+    ORM objects. Pass the resulting rows to serialize_rows.
+    """
+    return to_columns(model, get_fields(model, view))
+
+
+def serialize(obj, view="default"):
+    fields, getter = _registry[(type(obj), view)]
+    return dict(zip(fields, getter(obj)))
+
+
+def serialize_fields(obj, fields):
+    """
+    Like serialize, for an arbitrary tuple of fields (e.g. a projection).
+    """
+    return dict(zip(fields, _getter(fields)(obj)))
+
+
+def serialize_rows(rows, fields):
+    return [dict(zip(fields, row)) for row in rows]
@@ -1,4 +1,4 @@
-from flask import Blueprint, request, make_response
+from flask import Blueprint, request, make_response, g
 from ..database import db
 from ..models import User, Customer, Employee
 from sqlalchemy import or_
@@ -24,10 +24,12 @@ from ..utils.helpers import (
     validate_response,
     is_bcrypt_hash
 )
+from ..utils.hashing import HashingPoolSaturated
 from ..utils.http_status_codes import *
 from pydantic import ValidationError
 from ..schemas import UserCreate, UserResponse, UserUpdate
 from ..utils.smtp_server import OTP
+from ..utils.mailer import MailQueueFull
 
 auth_bp = Blueprint("auth", __name__, url_prefix="/api/v1/auth")
 otp_handler = OTP()
@@ -36,11 +38,11 @@ otp_handler = OTP()
 @validate_request(request_model=UserCreate)
 @validate_response(response_model=UserResponse)
 def register_user():
-    data = request.get_json()
+    data = g.payload.model_dump()
     username = data["username"]
     email = data["email"]
     nic = data["nic"]
-    role = data["role"] if "role" in data else "customer"
+    role = data["role"]
 
     # Check if user already exists
     user_ = db.session.query(User).filter_by(username=username).first()
@@ -69,10 +71,18 @@ def register_user():
     user_id = generate_user_id()
 
     # Create the base user
-    hashed_pw = hash_password(data["password"])
+    try:
+        hashed_pw = hash_password(data["password"])
+    except HashingPoolSaturated:
+        return {
+            "status": "error",
+            "message": "Server is busy, please try again",
+            "data": None,
+        }, HTTP_503_SERVICE_UNAVAILABLE
+
     user = User(u_id=user_id, username=username, password=hashed_pw, role=role)
 
-    image_ = data["image"] if "image" in data else None
+    image_ = data["image"]
     # Role-specific creation
     common_fields = {
         "customer_id" if role == "customer" else "employee_id": user_id,
@@ -128,7 +138,16 @@ def login_user():
             "data": None,
         }, HTTP_403_FORBIDDEN
 
-    if verify_password(password, user_.password):
+    try:
+        password_matches = verify_password(password, user_.password)
+    except HashingPoolSaturated:
+        return {
+            "status": "error",
+            "message": "Server is busy, please try again",
+            "data": None,
+        }, HTTP_503_SERVICE_UNAVAILABLE
+
+    if password_matches:
         access_token = create_access_token(
             identity=str(user_.u_id), additional_claims={"role": user_.role}
         )
@@ -258,12 +277,19 @@ def update_user(id):
             "data": None,
         }, HTTP_404_NOT_FOUND
     
-    data = request.get_json()
+    data = g.payload.model_dump(exclude_unset=True)
 
     
     if "password" in data:
         if not is_bcrypt_hash(data["password"]):
-            data["password"] = hash_password(data["password"])
+            try:
+                data["password"] = hash_password(data["password"])
+            except HashingPoolSaturated:
+                return {
+                    "status": "error",
+                    "message": "Server is busy, please try again",
+                    "data": None,
+                }, HTTP_503_SERVICE_UNAVAILABLE
     else:
         data["password"] = user.password
     
@@ -300,6 +326,10 @@ def update_user(id):
 @auth_bp.get("/generate-otp")
 @jwt_required()
 def generate_otp():
+    # The OTP store reads and writes one row, a lagging replica would lose
+    # a fresh code or an attempt
+    g.read_primary = True
+
     try:
         email = request.args.get("email")
 
@@ -310,8 +340,16 @@ def generate_otp():
                 "data": None
             }, HTTP_400_BAD_REQUEST
 
-        otp = otp_handler.generate_otp()
-        otp_handler.send_otp(email)
+        otp = otp_handler.generate_otp(get_jwt_identity())
+
+        try:
+            otp_handler.send_otp(email, otp)
+        except MailQueueFull:
+            return {
+                "status": "error",
+                "message": "Server is busy, please try again",
+                "data": None
+            }, HTTP_503_SERVICE_UNAVAILABLE
 
         return {
             "status": "success",
@@ -331,6 +369,9 @@ def generate_otp():
 @auth_bp.get("/validate-otp")
 @jwt_required()
 def validate_otp():
+    # Like generate_otp, the OTP row must be read from the primary
+    g.read_primary = True
+
     try:
         otp = request.args.get("otp")
 
@@ -341,7 +382,7 @@ def validate_otp():
                 "data": None
             }, HTTP_400_BAD_REQUEST
 
-        if otp_handler.validate_otp(otp):
+        if otp_handler.validate_otp(get_jwt_identity(), otp):
             return {
                 "status": "success",
                 "message": "OTP validated successfully.",
@@ -0,0 +1,147 @@
+import os
+import time
+import hashlib
+import threading
+from functools import wraps
+from flask import g, request, make_response, Response
+from dotenv import load_dotenv
+from .http_status_codes import *
+
+load_dotenv()
+
+
+class ResponseCache:
+    """
+    In-process TTL cache of serialized GET responses.
+
+    Entries are tagged so writes can drop exactly the responses they
+    affect. Every invalidation bumps a generation counter, and a response
+    rendered while an invalidation ran is not stored, so a slow read can't
+    put stale data back into the cache.
+
+    The cache and its invalidations are per process, other workers keep
+    serving their own copy until it expires after `ttl` seconds.
+
+    `public` responses may be stored by shared proxies, anything behind
+    authentication must only be cached by the client (`public=False`).
+    """
+
+    def __init__(self, ttl=60, max_age=30, max_entries=1024, public=True):
+        self.ttl = ttl
+        self.max_age = max_age
+        self.public = public
+        self.max_entries = max_entries
+        self._entries = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    @property
+    def generation(self):
+        return self._generation
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            if entry["expires_at"] < time.monotonic():
+                del self._entries[key]
+                return None
+
+            return entry
+
+    def set(self, key, body, mimetype, tags, generation):
+        entry = {
+            "body": body,
+            "mimetype": mimetype,
+            "etag": hashlib.sha1(body).hexdigest(),
+            "tags": frozenset(tags),
+            "expires_at": time.monotonic() + self.ttl,
+        }
+
+        with self._lock:
+            if generation != self._generation:
+                return entry
+
+            if len(self._entries) >= self.max_entries:
+                # Drop the entry closest to expiry
+                oldest = min(self._entries, key=lambda k: self._entries[k]["expires_at"])
+                del self._entries[oldest]
+
+            self._entries[key] = entry
+
+        return entry
+
+    def invalidate(self, *tags):
+        tags = set(tags)
+
+        with self._lock:
+            self._generation += 1
+            for key in [k for k, entry in self._entries.items() if entry["tags"] & tags]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+
+def cached_response(cache, tags, condition=None):
+    """
+    Serve a GET endpoint from `cache`, with ETag/If-None-Match and
+    Cache-Control headers. `tags` receives the view arguments and returns
+    the tags the response depends on. Only 200 responses are cached, and
+    only when `condition()` (if given) is true for the request.
+
+    Misses are rendered from the primary, a lagging replica would put the
+    data from before the last invalidation back into the cache.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if condition is not None and not condition():
+                return func(*args, **kwargs)
+
+            key = request.full_path
+            entry = cache.get(key)
+
+            if entry is None:
+                generation = cache.generation
+                g.read_primary = True
+                response = make_response(func(*args, **kwargs))
+
+                if response.status_code != HTTP_200_OK:
+                    return response
+
+                entry = cache.set(key, response.get_data(), response.mimetype, tags(**kwargs), generation)
+
+            if request.if_none_match.contains(entry["etag"]):
+                response = Response(status=HTTP_304_NOT_MODIFIED)
+            else:
+                response = Response(entry["body"], status=HTTP_200_OK, mimetype=entry["mimetype"])
+
+            response.set_etag(entry["etag"])
+            if cache.public:
+                response.cache_control.public = True
+            else:
+                response.cache_control.private = True
+            response.cache_control.max_age = cache.max_age
+            return response
+        return wrapper
+    return decorator
+
+
+analytics_cache = ResponseCache(
+    ttl=int(os.getenv("ANALYTICS_CACHE_TTL", 3600)),
+    max_age=int(os.getenv("ANALYTICS_CACHE_MAX_AGE", 300)),
+    max_entries=int(os.getenv("ANALYTICS_CACHE_SIZE", 256)),
+    # Staff only reports
+    public=False,
+)
+
+catalogue_cache = ResponseCache(
+    ttl=int(os.getenv("CATALOGUE_CACHE_TTL", 60)),
+    max_age=int(os.getenv("CATALOGUE_CACHE_MAX_AGE", 30)),
+    max_entries=int(os.getenv("CATALOGUE_CACHE_SIZE", 1024)),
+)
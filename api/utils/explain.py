@@ -0,0 +1,93 @@
+from contextlib import contextmanager
+from flask import current_app
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event
+from ..database import db
+
+# The filtered list requests, keyed by a short description of the route.
+# Placeholder ids only have to be well formed, the queries run either way.
+ROUTES = {
+    "GET /bookings?customer_id": "/api/v1/bookings/?customer_id=CUSTOMER",
+    "GET /bookings?car_id": "/api/v1/bookings/?car_id=CAR",
+    "GET /cars/availability": "/api/v1/cars/availability?start=2026-01-01T10:00:00&end=2026-01-02T10:00:00",
+    "GET /transactions?customer_id": "/api/v1/transactions/?customer_id=CUSTOMER",
+    "GET /transactions?car_id": "/api/v1/transactions/?car_id=CAR",
+    "GET /reviews?customer_id": "/api/v1/reviews/?customer_id=CUSTOMER",
+    "GET /notifications?user_id": "/api/v1/notifications/?user_id=USER",
+    "GET /customers": "/api/v1/customers/",
+    "GET /employees": "/api/v1/employees/",
+}
+
+
+@contextmanager
+def _recording(statements):
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    engines = list(db.engines.values())
+    for engine in engines:
+        event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield
+    finally:
+        for engine in engines:
+            event.remove(engine, "before_cursor_execute", record)
+
+
+def route_queries():
+    """
+    Request every route in ROUTES and return {route: [(sql, parameters)]}
+    of the SELECTs it ran, so the plans checked are the ones the routes
+    use, pagination included.
+    """
+    client = current_app.test_client()
+    client.set_cookie(
+        "access_token_cookie",
+        create_access_token(identity="explain-queries", additional_claims={"role": "employee"}),
+    )
+
+    queries = {}
+    for route, url in ROUTES.items():
+        statements = []
+        with _recording(statements):
+            client.get(url)
+        queries[route] = statements
+
+    return queries
+
+
+def _explain(connection, statement, parameters):
+    if connection.dialect.name == "sqlite":
+        rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).mappings().all()
+        # SEARCH is an index lookup, SCAN reads a whole table or index
+        return [
+            row["detail"] for row in rows
+            if row["detail"].startswith(("SCAN", "USE TEMP B-TREE FOR ORDER BY"))
+        ]
+
+    problems = []
+    for row in connection.exec_driver_sql(f"EXPLAIN {statement}", parameters).mappings():
+        if row["type"] == "ALL":
+            problems.append(f"full scan of {row['table']}")
+        elif row["type"] == "index":
+            problems.append(f"full index scan of {row['table']}")
+        if "Using filesort" in (row["Extra"] or ""):
+            problems.append(f"filesort of {row['table']}")
+    return problems
+
+
+def find_full_scans():
+    """
+    EXPLAIN every route query and return {route: [problems]} for the ones
+    that scan a whole table or index, or sort the rows to page them.
+    """
+    full_scans = {}
+    connection = db.session.connection()
+
+    for route, statements in route_queries().items():
+        scans = [scan for statement, parameters in statements for scan in _explain(connection, statement, parameters)]
+        if scans:
+            full_scans[route] = scans
+
+    return full_scans
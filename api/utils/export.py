@@ -0,0 +1,54 @@
+import csv
+import io
+from datetime import date
+from flask import Response, current_app, stream_with_context
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def _csv_value(value):
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+
+def export_rows(query, fields, fmt, filename):
+    """
+    Stream the rows of a column query as NDJSON or CSV. Rows are fetched
+    through a server-side cursor in batches of EXPORT_BATCH_SIZE and
+    written out as they arrive, so memory stays flat at any export size.
+    """
+    batch_size = current_app.config["EXPORT_BATCH_SIZE"]
+    rows = query.yield_per(batch_size)
+
+    def generate_ndjson():
+        dumps = current_app.json.dumps
+        chunk = []
+        for row in rows:
+            chunk.append(dumps(dict(zip(fields, row))))
+            if len(chunk) >= batch_size:
+                yield "\n".join(chunk) + "\n"
+                chunk = []
+        if chunk:
+            yield "\n".join(chunk) + "\n"
+
+    def generate_csv():
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(fields)
+        for i, row in enumerate(rows, start=1):
+            writer.writerow([_csv_value(value) for value in row])
+            if i % batch_size == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue()
+
+    generate = generate_csv if fmt == "csv" else generate_ndjson
+
+    response = Response(stream_with_context(generate()), mimetype=EXPORT_FORMATS[fmt])
+    response.headers["Content-Disposition"] = f'attachment; filename="{filename}.{fmt}"'
+    return response
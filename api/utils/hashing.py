@@ -0,0 +1,151 @@
+import os
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+import bcrypt
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+class HashingPoolSaturated(Exception):
+    pass
+
+
+def _hash(password, rounds):
+    return bcrypt.hashpw(password, bcrypt.gensalt(rounds))
+
+
+def _verify(password, hashed):
+    return bcrypt.checkpw(password, hashed)
+
+
+class HashingPool:
+    """
+    Runs bcrypt in a dedicated process pool so hashing neither blocks
+    request threads on the GIL nor queues up without bound.
+
+    At most `max_workers + queue_depth` jobs are accepted at once, any
+    further job raises HashingPoolSaturated straight away. With
+    max_workers=0 hashing runs inline on the calling thread.
+
+    Workers are spawned rather than forked: the app process already runs
+    threads (mailer, periodic and background jobs), and a forked child can
+    inherit a lock one of them held and deadlock on it.
+    """
+
+    def __init__(self, max_workers, queue_depth, timeout, rounds):
+        self.max_workers = max_workers
+        self.queue_depth = queue_depth
+        self.timeout = timeout
+        self.rounds = rounds
+        self._executor = None
+        self._slots = threading.BoundedSemaphore(max_workers + queue_depth)
+        self._lock = threading.Lock()
+        self._stats = {
+            "submitted": 0,
+            "completed": 0,
+            "rejected": 0,
+            "timed_out": 0,
+            "in_flight": 0,
+        }
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    def _reset(self, executor):
+        """
+        Drop a broken executor, the next job starts a fresh one.
+        """
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _count(self, key, value=1):
+        with self._lock:
+            self._stats[key] += value
+
+    def _release(self, future):
+        self._slots.release()
+        self._count("in_flight", -1)
+        self._count("completed")
+
+    def _run(self, func, *args):
+        if not self.max_workers:
+            return func(*args)
+
+        try:
+            return self._submit(func, *args)
+        except BrokenProcessPool:
+            # A worker died (e.g. killed by the OOM killer), which breaks the
+            # whole executor. It has been replaced, retry once on the new one.
+            return self._submit(func, *args)
+
+    def _submit(self, func, *args):
+        if not self._slots.acquire(blocking=False):
+            self._count("rejected")
+            raise HashingPoolSaturated("Password hashing pool is saturated")
+
+        self._count("submitted")
+        self._count("in_flight")
+
+        executor = self._get_executor()
+        try:
+            future = executor.submit(func, *args)
+        except Exception as e:
+            self._slots.release()
+            self._count("in_flight", -1)
+            if isinstance(e, BrokenProcessPool):
+                self._reset(executor)
+            raise
+
+        future.add_done_callback(self._release)
+
+        try:
+            return future.result(timeout=self.timeout)
+        except TimeoutError:
+            self._count("timed_out")
+            raise HashingPoolSaturated("Password hashing timed out")
+        except BrokenProcessPool:
+            self._reset(executor)
+            raise
+
+    def hash(self, password):
+        return self._run(_hash, password.encode("utf-8"), self.rounds).decode("utf-8")
+
+    def verify(self, password, hashed):
+        return self._run(_verify, password.encode("utf-8"), hashed.encode("utf-8"))
+
+    def metrics(self):
+        with self._lock:
+            stats = dict(self._stats)
+
+        stats.update({
+            "workers": self.max_workers,
+            "queue_depth": self.queue_depth,
+            "capacity": self.max_workers + self.queue_depth,
+            "rounds": self.rounds,
+        })
+        return stats
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+hashing_pool = HashingPool(
+    max_workers=int(os.getenv("HASHING_WORKERS", os.cpu_count() or 1)),
+    queue_depth=int(os.getenv("HASHING_QUEUE_DEPTH", 32)),
+    timeout=float(os.getenv("HASHING_TIMEOUT", 10)),
+    rounds=int(os.getenv("BCRYPT_ROUNDS", 12)),
+)
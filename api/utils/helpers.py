@@ -1,13 +1,15 @@
-import random, string, re
+import random, string, re, base64, binascii
 from datetime import datetime, timezone
 from flask_jwt_extended import decode_token
 from ..models import Token
 from ..database import db
-from bcrypt import hashpw, checkpw
 from functools import wraps
-from flask import jsonify, request
-from pydantic import ValidationError
+from flask import jsonify, request, current_app, abort, g
+from pydantic import ValidationError, TypeAdapter
 from ..utils.http_status_codes import *
+from .token_cache import revocation_cache
+from .hashing import hashing_pool
+from ..serializers import get_fields
 
 def add_token_to_database(token):
     """
@@ -27,20 +29,24 @@ def add_token_to_database(token):
 
     db.session.add(db_token)
     db.session.commit()
-    db.session.refresh(db_token)
+
+    revocation_cache.set(jti, user_id, False)
 
 
 def revoke_token(token_jti, user_id):
     """
     Revoke a token by setting revoked_at to current UTC time.
     """
-    token = Token.query.filter_by(jti=token_jti, user_id=user_id).first()
+    updated = Token.query.filter_by(jti=token_jti, user_id=user_id).update(
+        {"revoked_at": datetime.now(timezone.utc)}, synchronize_session=False
+    )
 
-    if not token:
+    if not updated:
+        db.session.rollback()
         raise Exception(f"Could not find token {token_jti}")
 
-    token.revoked_at = datetime.now(timezone.utc)
     db.session.commit()
+    revocation_cache.set(token_jti, user_id, True)
 
 
 def is_token_revoked(token_jti, user_id):
@@ -48,12 +54,49 @@ def is_token_revoked(token_jti, user_id):
     Check if a token is revoked.
     Returns True if revoked, False otherwise.
     """
+    revoked = revocation_cache.get(token_jti, user_id)
+    if revoked is not None:
+        return revoked
+
     token = Token.query.filter_by(jti=token_jti, user_id=user_id).first()
 
     if not token:
         raise Exception(f"Could not find token {token_jti}")
 
-    return token.revoked_at is not None
+    revoked = token.revoked_at is not None
+    revocation_cache.set(token_jti, user_id, revoked)
+    return revoked
+
+
+def purge_expired_tokens(batch_size=1000):
+    """
+    Delete expired tokens from the blocklist in chunks of `batch_size`,
+    committing after each chunk so no DELETE holds its locks for long.
+    Returns the number of deleted tokens.
+    """
+    now = datetime.now()
+    deleted = 0
+
+    while True:
+        ids = [
+            id for (id,) in db.session.query(Token.id)
+            .filter(Token.expires < now)
+            .order_by(Token.id)
+            .limit(batch_size)
+            .all()
+        ]
+
+        if not ids:
+            break
+
+        Token.query.filter(Token.id.in_(ids)).delete(synchronize_session=False)
+        db.session.commit()
+        deleted += len(ids)
+
+        if len(ids) < batch_size:
+            break
+
+    return deleted
 
 
 alphabet = string.ascii_uppercase
@@ -93,60 +136,45 @@ def generate_notification_id():
     return "NT_" + generate_id(8)
 
 
-import bcrypt
-
 def hash_password(plain_password):
-    hashed = hashpw(plain_password.encode("utf-8"), bcrypt.gensalt())
-    return hashed.decode("utf-8")
+    """
+    Raises HashingPoolSaturated when the hashing pool is full.
+    """
+    return hashing_pool.hash(plain_password)
 
 
 def verify_password(plain_password, hashed_password):
-    return checkpw(
-        plain_password.encode("utf-8"),
-        hashed_password.encode("utf-8")
-    )
-
-# utils/response_validator.py
-
-def validate_response(model):
-    def decorator(func):
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            response, status_code = func(*args, **kwargs)
-
-            try:
-                model.parse_obj(response)
-            except ValidationError as e:
-                # Log validation error and return a 500 error
-                return jsonify({
-                    "status": "error",
-                    "message": "Response validation failed",
-                    "details": e.errors()
-                }), 500
-
-            return jsonify(response), status_code
-        return wrapper
-    return decorator
+    """
+    Raises HashingPoolSaturated when the hashing pool is full.
+    """
+    return hashing_pool.verify(plain_password, hashed_password)
 
 def validate_request(request_model):
+    """
+    Parse and validate the JSON body in a single pass with a TypeAdapter
+    built once per route, and expose the typed result as `g.payload`.
+    """
+    adapter = TypeAdapter(request_model)
+
     def decorator(func):
         @wraps(func)
         def wrapper(*args, **kwargs):
-            data = request.get_json()
+            body = request.get_data()
 
-            if not data:
+            if not body.strip():
                 return jsonify({
                     "status": "error",
                     "message": "Invalid or missing JSON body"
                 }), HTTP_400_BAD_REQUEST
 
             try:
-                request_model.parse_obj(data)
+                g.payload = adapter.validate_json(body)
             except ValidationError as e:
                 return jsonify({
                     "status": "error",
                     "message": "Request validation failed",
-                    "details": e.errors()
+                    # The input of a JSON parse error is the raw body bytes
+                    "details": e.errors(include_input=False)
                 }), HTTP_400_BAD_REQUEST 
             
             return func(*args, **kwargs)
@@ -154,12 +182,21 @@ def validate_request(request_model):
     return decorator
 
 def validate_response(response_model):
+    """
+    Serialize the handler's response. The payload is only checked against
+    `response_model` when VALIDATE_RESPONSES is enabled (debug and tests),
+    in production it is serialized once without being parsed again.
+    """
     def decorator(func):
         @wraps(func)
         def wrapper(*args, **kwargs):
             response_data, status_code = func(*args, **kwargs)
+
+            if not current_app.config["VALIDATE_RESPONSES"] or g.get("projection"):
+                return jsonify(response_data), status_code
+
             try:
-                response_model.parse_obj(response_data)
+                response_model.model_validate(response_data)
             except ValidationError as e:
                 return jsonify({
                     "status": "error",
@@ -171,6 +208,26 @@ def validate_response(response_model):
         return wrapper
     return decorator
 
+def bulk_response(results, noun):
+    """
+    Wrap the per-item results of a bulk create: 201 when every item was
+    created, 207 when only some were and 400 when none were.
+    """
+    created = sum(1 for result in results if result["status"] == "success")
+
+    if created == len(results):
+        status_code = HTTP_201_CREATED
+    elif created:
+        status_code = HTTP_207_MULTI_STATUS
+    else:
+        status_code = HTTP_400_BAD_REQUEST
+
+    return {
+        "status": "success" if created else "error",
+        "message": f"Created {created} of {len(results)} {noun}",
+        "data": results,
+    }, status_code
+
 def role_based():
     def decorator(func):
         @wraps(func)
@@ -190,6 +247,88 @@ def role_based():
     return decorator
 
 
+def encode_cursor(value):
+    return base64.urlsafe_b64encode(str(value).encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor):
+    try:
+        return base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+    except (binascii.Error, UnicodeError, ValueError):
+        abort(HTTP_400_BAD_REQUEST, description="Invalid cursor")
+
+
+def get_page_args():
+    """
+    Read the `limit` and `after` query params of a list request.
+    """
+    limit = request.args.get("limit", current_app.config["DEFAULT_PAGE_SIZE"])
+    try:
+        limit = int(limit)
+    except (TypeError, ValueError):
+        abort(HTTP_400_BAD_REQUEST, description="limit must be an integer")
+
+    if limit < 1:
+        abort(HTTP_400_BAD_REQUEST, description="limit must be greater than 0")
+
+    limit = min(limit, current_app.config["MAX_PAGE_SIZE"])
+
+    after = request.args.get("after")
+    if after:
+        after = decode_cursor(after)
+
+    return limit, after
+
+
+def paginate(query, key):
+    """
+    Keyset pagination ordered by `key` (a unique column).
+    Returns the page of items and the cursor of the next page, or None
+    when this is the last page.
+    """
+    limit, after = get_page_args()
+
+    if after:
+        query = query.filter(key > after)
+
+    items = query.order_by(key).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        next_cursor = encode_cursor(getattr(items[-1], key.key))
+
+    return items, next_cursor
+
+
+def get_projection(model, view="default", extras=()):
+    """
+    Read the `fields` query param of a list request.
+    Returns the model fields to load, always starting with the primary key
+    (even when the view leaves it out), and the requested `extras` (nested
+    or derived keys of the response).
+    Without `fields` every field of the view and every extra is returned.
+    """
+    fields = get_fields(model, view)
+    requested = request.args.get("fields")
+
+    if not requested:
+        return fields, set(extras)
+
+    primary_key = tuple(column.key for column in model.__mapper__.primary_key)
+
+    names = {name.strip() for name in requested.split(",") if name.strip()}
+    unknown = names - set(fields) - set(primary_key) - set(extras)
+    if unknown:
+        abort(HTTP_400_BAD_REQUEST, description=f"Unknown fields: {', '.join(sorted(unknown))}")
+
+    # Projected payloads leave out fields the response schemas require
+    g.projection = True
+
+    fields = primary_key + tuple(field for field in fields if field in names and field not in primary_key)
+    return fields, names & set(extras)
+
+
 BCRYPT_PATTERN = re.compile(r"^\$2[aby]\$\d{2}\$[./A-Za-z0-9]{53}$")
 
 def is_bcrypt_hash(password: str) -> bool:
@@ -0,0 +1,106 @@
+import uuid
+import threading
+from datetime import datetime, timedelta
+from sqlalchemy import select, update
+from ..database import db
+from ..models import Job
+
+ACTIVE = ("pending", "running")
+
+
+class JobRegistry:
+    """
+    Runs one-off jobs on daemon threads and keeps their state in the jobs
+    table, so progress can be polled from any worker.
+
+    Job functions are registered by name and called as
+    `func(progress, cursor, **params)`. Before committing each unit of work
+    they call `progress(count, cursor, total=None)`, which records the work
+    in the same transaction. When a worker dies mid-job the job's heartbeat
+    goes stale and `resume_stale()` restarts it from its last cursor.
+    """
+
+    def __init__(self):
+        self._funcs = {}
+
+    def register(self, name):
+        def decorator(func):
+            self._funcs[name] = func
+            return func
+        return decorator
+
+    def get(self, job_id):
+        job = db.session.get(Job, job_id)
+        return job.as_dict() if job else None
+
+    def start(self, app, name, **params):
+        job = Job(job_id=uuid.uuid4().hex, name=name, params=params)
+        db.session.add(job)
+        db.session.commit()
+
+        resp_data = job.as_dict()
+        self._spawn(app, job.job_id)
+        return resp_data
+
+    def resume_stale(self, app, stale_after):
+        """
+        Take over the active jobs whose heartbeat is older than
+        `stale_after` seconds and return how many were resumed.
+        """
+        stale_before = datetime.now() - timedelta(seconds=stale_after)
+        job_ids = db.session.scalars(
+            select(Job.job_id).where(Job.status.in_(ACTIVE), Job.heartbeat_at < stale_before)
+        ).all()
+
+        resumed = 0
+        for job_id in job_ids:
+            # Only one worker wins the conditional update
+            claimed = db.session.execute(
+                update(Job)
+                .where(Job.job_id == job_id, Job.status.in_(ACTIVE), Job.heartbeat_at < stale_before)
+                .values(heartbeat_at=datetime.now())
+            ).rowcount
+            db.session.commit()
+
+            if claimed:
+                self._spawn(app, job_id)
+                resumed += 1
+
+        return resumed
+
+    def _spawn(self, app, job_id):
+        threading.Thread(target=self._run, args=(app, job_id), name=f"job-{job_id}", daemon=True).start()
+
+    def _run(self, app, job_id):
+        with app.app_context():
+            job = db.session.get(Job, job_id)
+            func, cursor, params = self._funcs[job.name], job.cursor, job.params
+
+            def progress(count, cursor=None, total=None):
+                values = {"processed": Job.processed + count, "heartbeat_at": datetime.now()}
+                if cursor is not None:
+                    values["cursor"] = cursor
+                if total is not None:
+                    values["total"] = total
+                db.session.execute(update(Job).where(Job.job_id == job_id).values(**values))
+
+            job.status = "running"
+            db.session.commit()
+
+            try:
+                func(progress, cursor, **params)
+                status, error = "done", None
+            except Exception as e:
+                db.session.rollback()
+                app.logger.exception("Job %s failed", job_id)
+                status, error = "failed", str(e)
+
+            db.session.execute(
+                update(Job)
+                .where(Job.job_id == job_id)
+                .values(status=status, error=error, finished_at=datetime.now())
+            )
+            db.session.commit()
+
+
+job_registry = JobRegistry()
@@ -0,0 +1,263 @@
+import os
+import heapq
+import itertools
+import queue
+import smtplib
+import threading
+import time
+import logging
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+
+class MailQueueFull(Exception):
+    pass
+
+
+def is_permanent(error):
+    """
+    5xx replies won't succeed on a retry, 4xx replies and dropped
+    connections might.
+    """
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return all(code >= 500 for code, _ in error.recipients.values())
+    return isinstance(error, smtplib.SMTPResponseException) and error.smtp_code >= 500
+
+
+class SMTPConnectionPool:
+    """
+    Keeps authenticated SMTP connections open between sends. Idle
+    connections are checked with NOOP before reuse and replaced when the
+    server has dropped them.
+    """
+
+    def __init__(self, host, port, username=None, password=None, starttls=True, timeout=30):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+
+    def _connect(self):
+        server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        server.ehlo()
+        if self.starttls:
+            server.starttls()
+            server.ehlo()
+        if self.username:
+            server.login(self.username, self.password)
+        return server
+
+    def acquire(self):
+        while True:
+            try:
+                server = self._idle.get_nowait()
+            except queue.Empty:
+                return self._connect()
+
+            try:
+                if server.noop()[0] == 250:
+                    return server
+            except OSError:
+                # SMTPException or a socket error, either way the connection is gone
+                pass
+            self.discard(server)
+
+    def release(self, server):
+        self._idle.put(server)
+
+    def discard(self, server):
+        try:
+            server.quit()
+        except Exception:
+            try:
+                server.close()
+            except Exception:
+                pass
+
+    def close(self):
+        while True:
+            try:
+                self.discard(self._idle.get_nowait())
+            except queue.Empty:
+                return
+
+
+class Mailer:
+    """
+    Outbound mail queue drained by background sender threads.
+
+    Each sender takes up to `batch_size` queued messages and sends them over
+    one pooled connection. Transient failures are scheduled for another
+    attempt after an exponential backoff, without holding up the messages
+    behind them, permanent refusals are dropped.
+    """
+
+    def __init__(self, pool, workers=2, batch_size=20, max_retries=3, backoff=1.0, queue_size=1000):
+        self.pool = pool
+        self.workers = workers
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self._queue = queue.Queue(maxsize=queue_size)
+        # (not_before, sequence, message, attempt), still counted as unfinished in _queue
+        self._retries = []
+        self._sequence = itertools.count()
+        self._retry_lock = threading.Lock()
+        self._threads = []
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self._threads:
+                return
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._run, name=f"mailer-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def send(self, message):
+        """
+        Enqueue a message and return immediately.
+        Raises MailQueueFull when the queue is at capacity.
+        """
+        self.start()
+        try:
+            self._queue.put_nowait((message, 0))
+        except queue.Full:
+            raise MailQueueFull("Outbound mail queue is full")
+
+    def _schedule_retry(self, message, attempt):
+        not_before = time.monotonic() + self.backoff * 2 ** (attempt - 1)
+        with self._retry_lock:
+            heapq.heappush(self._retries, (not_before, next(self._sequence), message, attempt))
+
+    def _due_retries(self):
+        now = time.monotonic()
+        due = []
+        with self._retry_lock:
+            while self._retries and self._retries[0][0] <= now and len(due) < self.batch_size:
+                _, _, message, attempt = heapq.heappop(self._retries)
+                due.append((message, attempt))
+        return due
+
+    def _until_next_retry(self):
+        with self._retry_lock:
+            if not self._retries:
+                return None
+            return max(self._retries[0][0] - time.monotonic(), 0)
+
+    def _next_batch(self):
+        """
+        Up to `batch_size` messages, retries that are due first. Waits for
+        a new message or for the next retry to come due.
+        """
+        while True:
+            batch = self._due_retries()
+            if not batch:
+                try:
+                    batch.append(self._queue.get(timeout=self._until_next_retry()))
+                except queue.Empty:
+                    continue
+
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            retry = []
+            try:
+                retry = self._send_batch(batch)
+            finally:
+                for message, attempt in retry:
+                    self._schedule_retry(message, attempt)
+                for _ in range(len(batch) - len(retry)):
+                    self._queue.task_done()
+
+    def _send_over(self, server, pending):
+        """
+        Send `pending` over one connection, returning the messages that
+        failed and may succeed later. The connection is returned to the
+        pool unless it dropped.
+        """
+        failed = []
+
+        for i, (message, attempt) in enumerate(pending):
+            # SMTPException subclasses OSError, so the order of these matters:
+            # a refused message keeps the connection, a dropped socket does not
+            try:
+                server.send_message(message)
+            except smtplib.SMTPServerDisconnected as e:
+                logger.warning("SMTP connection lost: %s", e)
+                self.pool.discard(server)
+                return failed + pending[i:]
+            except smtplib.SMTPException as e:
+                if is_permanent(e):
+                    logger.error("Mail to %s refused: %s", message["To"], e)
+                else:
+                    logger.warning("Failed to send mail to %s: %s", message["To"], e)
+                    failed.append((message, attempt))
+            except OSError as e:
+                logger.warning("SMTP connection lost: %s", e)
+                self.pool.discard(server)
+                return failed + pending[i:]
+
+        self.pool.release(server)
+        return failed
+
+    def _send_batch(self, batch):
+        """
+        Make one attempt at `batch` and return the messages to retry, with
+        their next attempt number.
+        """
+        try:
+            failed = self._send_over(self.pool.acquire(), batch)
+        except (smtplib.SMTPException, OSError) as e:
+            logger.warning("Could not connect to SMTP server: %s", e)
+            failed = batch
+
+        retry = []
+        for message, attempt in failed:
+            if attempt >= self.max_retries:
+                logger.error("Giving up on mail to %s after %d attempts", message["To"], attempt + 1)
+            else:
+                retry.append((message, attempt + 1))
+        return retry
+
+    def join(self):
+        """
+        Block until every queued message has been handled.
+        """
+        self._queue.join()
+
+
+def create_mailer():
+    pool = SMTPConnectionPool(
+        host=os.getenv("SMTP_SERVER"),
+        port=int(os.getenv("SMTP_PORT", 587)),
+        username=os.getenv("GMAIL_USERNAME"),
+        password=os.getenv("PASSWORD"),
+        starttls=os.getenv("SMTP_STARTTLS", "true").lower() == "true",
+    )
+
+    return Mailer(
+        pool,
+        workers=int(os.getenv("SMTP_WORKERS", 2)),
+        batch_size=int(os.getenv("SMTP_BATCH_SIZE", 20)),
+        max_retries=int(os.getenv("SMTP_MAX_RETRIES", 3)),
+        backoff=float(os.getenv("SMTP_RETRY_BACKOFF", 1.0)),
+        queue_size=int(os.getenv("MAIL_QUEUE_SIZE", 1000)),
+    )
+
+
+mailer = create_mailer()
@@ -0,0 +1,116 @@
+import os
+import hmac
+import hashlib
+import secrets
+import threading
+from datetime import datetime, timedelta
+from dotenv import load_dotenv
+from ..database import db
+from ..models import OTPCode
+
+load_dotenv()
+
+
+def hash_code(key, code):
+    return hashlib.sha256(f"{key}:{code}".encode("utf-8")).hexdigest()
+
+
+class MemoryOTPBackend:
+    """
+    Dict-backed backend, only shared by the threads of one worker.
+    """
+
+    def __init__(self):
+        self._codes = {}
+        self._lock = threading.Lock()
+
+    def put(self, key, code_hash, expires_at):
+        with self._lock:
+            self._codes[key] = {"code_hash": code_hash, "expires_at": expires_at, "attempts": 0}
+
+    def check(self, key, code_hash, max_attempts):
+        with self._lock:
+            entry = self._codes.get(key)
+            if entry is None:
+                return False
+
+            if entry["expires_at"] < datetime.now():
+                del self._codes[key]
+                return False
+
+            if hmac.compare_digest(entry["code_hash"], code_hash):
+                del self._codes[key]
+                return True
+
+            entry["attempts"] += 1
+            if entry["attempts"] >= max_attempts:
+                del self._codes[key]
+            return False
+
+
+class SQLOTPBackend:
+    """
+    Stores codes in the otp_codes table so every worker sees them.
+    """
+
+    def put(self, key, code_hash, expires_at):
+        db.session.merge(OTPCode(key=key, code_hash=code_hash, attempts=0, expires_at=expires_at))
+        db.session.commit()
+
+    def check(self, key, code_hash, max_attempts):
+        entry = OTPCode.query.filter_by(key=key).with_for_update().first()
+        if entry is None:
+            db.session.rollback()
+            return False
+
+        if entry.expires_at < datetime.now():
+            valid = False
+            db.session.delete(entry)
+        elif hmac.compare_digest(entry.code_hash, code_hash):
+            valid = True
+            db.session.delete(entry)
+        else:
+            valid = False
+            entry.attempts += 1
+            if entry.attempts >= max_attempts:
+                db.session.delete(entry)
+
+        db.session.commit()
+        return valid
+
+
+class OTPStore:
+    """
+    One-time codes keyed by user, each with an expiry and a limited
+    number of attempts. A code is removed once it is used, expires or
+    runs out of attempts.
+    """
+
+    def __init__(self, backend, ttl=300, max_attempts=5):
+        self.backend = backend
+        self.ttl = ttl
+        self.max_attempts = max_attempts
+
+    def issue(self, key):
+        code = secrets.randbelow(900000) + 100000
+        expires_at = datetime.now() + timedelta(seconds=self.ttl)
+        self.backend.put(key, hash_code(key, code), expires_at)
+        return code
+
+    def verify(self, key, code):
+        return self.backend.check(key, hash_code(key, str(code).strip()), self.max_attempts)
+
+
+def create_otp_store():
+    backend = os.getenv("OTP_BACKEND", "memory")
+
+    if backend == "sql":
+        backend = SQLOTPBackend()
+    else:
+        backend = MemoryOTPBackend()
+
+    return OTPStore(
+        backend,
+        ttl=int(os.getenv("OTP_TTL", 300)),
+        max_attempts=int(os.getenv("OTP_MAX_ATTEMPTS", 5)),
+    )
@@ -0,0 +1,110 @@
+import os
+import time
+import queue
+import threading
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+class LocalBroker:
+    """
+    Fans messages out to the subscribers of the current process. Only
+    suitable for a single worker, use RedisBroker when there are several.
+    """
+
+    def __init__(self, queue_size=100):
+        self.queue_size = queue_size
+        self._subscribers = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, channel):
+        subscriber = queue.Queue(maxsize=self.queue_size)
+        with self._lock:
+            self._subscribers.setdefault(channel, set()).add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, channel, subscriber):
+        with self._lock:
+            subscribers = self._subscribers.get(channel)
+            if subscribers is None:
+                return
+
+            subscribers.discard(subscriber)
+            if not subscribers:
+                del self._subscribers[channel]
+
+    def deliver(self, channel, message):
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+
+        for subscriber in subscribers:
+            try:
+                subscriber.put_nowait(message)
+            except queue.Full:
+                # A stalled client loses messages, it catches up with `since=`
+                pass
+
+    def publish(self, channel, message):
+        self.deliver(channel, message)
+
+
+class RedisBroker(LocalBroker):
+    """
+    Publishes through redis so every worker sees every message. A listener
+    thread per process hands them to the local subscribers.
+
+    Nothing connects until the first publish or subscribe, so an
+    unreachable redis fails those calls instead of the app startup.
+    """
+
+    prefix = "pubsub:"
+
+    def __init__(self, url, queue_size=100):
+        super().__init__(queue_size)
+        self.url = url
+        self._client = None
+        self._pubsub = None
+        self._connect_lock = threading.Lock()
+
+    def _connect(self):
+        with self._connect_lock:
+            if self._client is None:
+                import redis
+
+                client = redis.Redis.from_url(self.url)
+                pubsub = client.pubsub(ignore_subscribe_messages=True)
+                pubsub.psubscribe(f"{self.prefix}*")
+                self._client, self._pubsub = client, pubsub
+                threading.Thread(target=self._listen, name="pubsub-listener", daemon=True).start()
+
+        return self._client
+
+    def _listen(self):
+        while True:
+            try:
+                for message in self._pubsub.listen():
+                    channel = message["channel"].decode()[len(self.prefix):]
+                    self.deliver(channel, message["data"].decode())
+            except Exception:
+                # redis-py resubscribes on the next read after a reconnect
+                time.sleep(1)
+
+    def subscribe(self, channel):
+        self._connect()
+        return super().subscribe(channel)
+
+    def publish(self, channel, message):
+        self._connect().publish(f"{self.prefix}{channel}", message)
+
+
+def create_broker():
+    url = os.getenv("PUBSUB_URL")
+    queue_size = int(os.getenv("PUBSUB_QUEUE_SIZE", 100))
+
+    if not url or url == "memory://":
+        return LocalBroker(queue_size)
+    return RedisBroker(url, queue_size)
+
+
+broker = create_broker()
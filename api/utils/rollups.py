@@ -0,0 +1,224 @@
+import os
+from datetime import date, datetime, time, timedelta
+from dotenv import load_dotenv
+from sqlalchemy import delete, event, func, insert, inspect, select, tuple_
+from ..database import db, RoutingSession
+from .cache import analytics_cache
+from ..models import Booking, DailyCarRollup, RollupPending, RollupWatermark, Service, Transaction
+
+load_dotenv()
+
+WATERMARK = "daily_car_rollups"
+
+# Rows committed slightly after the run started may carry an earlier
+# updated_at, so every run re-reads this many seconds before the watermark.
+# Recomputing a (day, car) pair is idempotent, so the overlap is harmless.
+OVERLAP = timedelta(seconds=int(os.getenv("ROLLUP_OVERLAP", 300)))
+
+BATCH_SIZE = 500
+
+EMPTY = {"bookings_count": 0, "revenue": 0.0, "fines": 0.0, "service_spend": 0.0}
+
+# model -> (date column, aggregate columns of the rollup)
+SOURCES = {
+    Booking: (Booking.booked_at, lambda: {
+        "bookings_count": func.count(Booking.booking_id),
+        "fines": func.coalesce(func.sum(Booking.fine), 0),
+    }),
+    Transaction: (Transaction.date, lambda: {
+        "revenue": func.coalesce(func.sum(Transaction.transaction_amount), 0),
+    }),
+    Service: (Service.service_date, lambda: {
+        "service_spend": func.coalesce(func.sum(Service.transaction_amount), 0),
+    }),
+}
+
+
+def _as_date(value):
+    # DATE() comes back as a string on SQLite
+    if isinstance(value, str):
+        return date.fromisoformat(value)
+    if isinstance(value, datetime):
+        return value.date()
+    return value
+
+
+def _pending(day, car_id):
+    return RollupPending(day=_as_date(day), car_id=car_id)
+
+
+@event.listens_for(RoutingSession, "before_flush")
+def track_deletes(session, flush_context, instances):
+    """
+    Deleted rows leave no updated_at behind and moved rows leave their old
+    (day, car) pair stale, so remember those pairs for the next rollup run.
+    """
+    for obj in list(session.deleted):
+        source = SOURCES.get(type(obj))
+        if source is None:
+            continue
+
+        day = getattr(obj, source[0].key)
+        if day is not None:
+            session.add(_pending(day, obj.car_id))
+
+    for obj in list(session.dirty):
+        source = SOURCES.get(type(obj))
+        if source is None:
+            continue
+
+        attrs = inspect(obj).attrs
+        day_history = attrs[source[0].key].history
+        car_history = attrs.car_id.history
+        if not (day_history.deleted or car_history.deleted):
+            continue
+
+        day = day_history.deleted[0] if day_history.deleted else getattr(obj, source[0].key)
+        car_id = car_history.deleted[0] if car_history.deleted else obj.car_id
+        if day is not None:
+            session.add(_pending(day, car_id))
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def track_bulk_moves(orm_execute_state):
+    """
+    Bulk UPDATEs (Query.update, update(Model)) bypass the unit of work, so
+    read the old (day, car) pairs of the rows they move before they run.
+    """
+    if not orm_execute_state.is_update or orm_execute_state.bind_mapper is None:
+        return
+
+    model = orm_execute_state.bind_mapper.class_
+    source = SOURCES.get(model)
+    if source is None:
+        return
+
+    date_column = source[0]
+    statement = orm_execute_state.statement
+    parameters = orm_execute_state.parameters
+    # update(Model) with a list of dicts is a bulk UPDATE by primary key
+    by_primary_key = isinstance(parameters, list)
+
+    keys = {getattr(column, "key", column) for column in statement._values or ()}
+    if by_primary_key:
+        keys.update(*parameters)
+    if not keys & {date_column.key, "car_id"}:
+        return
+
+    query = select(date_column, model.car_id)
+    if statement.whereclause is not None:
+        query = query.where(statement.whereclause)
+    if by_primary_key:
+        primary_key = model.__mapper__.primary_key[0]
+        query = query.where(primary_key.in_([params[primary_key.key] for params in parameters]))
+
+    session = orm_execute_state.session
+    for day, car_id in session.execute(query).all():
+        if day is not None:
+            session.add(_pending(day, car_id))
+
+
+def _changed_pairs(since):
+    pairs = set()
+
+    for model, (date_column, _) in SOURCES.items():
+        rows = db.session.execute(
+            select(func.date(date_column), model.car_id)
+            .where(model.updated_at >= since)
+            .distinct()
+        )
+        pairs.update((_as_date(day), car_id) for day, car_id in rows)
+
+    return pairs
+
+
+def _totals(pairs=None):
+    """
+    Per (day, car) totals from the base tables, for all pairs or only
+    the given ones.
+    """
+    totals = {}
+
+    for model, (date_column, aggregates) in SOURCES.items():
+        aggregates = aggregates()
+        day = func.date(date_column)
+        query = select(day, model.car_id, *aggregates.values())
+
+        if pairs is not None:
+            days = sorted({d for d, _ in pairs})
+            query = query.where(
+                model.car_id.in_({car_id for _, car_id in pairs}),
+                date_column >= datetime.combine(days[0], time.min),
+                date_column < datetime.combine(days[-1] + timedelta(days=1), time.min),
+            )
+
+        for row_day, car_id, *values in db.session.execute(query.group_by(day, model.car_id)):
+            key = (_as_date(row_day), car_id)
+            if pairs is not None and key not in pairs:
+                continue
+
+            totals.setdefault(key, {}).update(zip(aggregates, values))
+
+    return totals
+
+
+def _write(pairs, totals):
+    pairs = sorted(pairs)
+
+    for i in range(0, len(pairs), BATCH_SIZE):
+        batch = pairs[i:i + BATCH_SIZE]
+        db.session.execute(
+            delete(DailyCarRollup).where(
+                tuple_(DailyCarRollup.day, DailyCarRollup.car_id).in_(batch)
+            )
+        )
+
+        rows = [
+            {"day": day, "car_id": car_id, **EMPTY, **totals[(day, car_id)]}
+            for day, car_id in batch
+            if (day, car_id) in totals
+        ]
+        if rows:
+            db.session.execute(insert(DailyCarRollup), rows)
+
+
+def refresh_daily_rollups(full=False):
+    """
+    Bring daily_car_rollups up to date and return the number of (day, car)
+    pairs recomputed. Only pairs touched since the watermark are read,
+    unless `full` rebuilds the whole table.
+    """
+    started_at = datetime.now()
+    watermark = db.session.get(RollupWatermark, WATERMARK)
+    pending = db.session.execute(select(RollupPending.id, RollupPending.day, RollupPending.car_id)).all()
+    pending_ids = [row.id for row in pending]
+
+    try:
+        if full or watermark is None:
+            totals = _totals()
+            db.session.execute(delete(DailyCarRollup))
+            _write(totals.keys(), totals)
+            pairs = totals.keys()
+        else:
+            pairs = _changed_pairs(watermark.watermark - OVERLAP)
+            pairs.update((day, car_id) for _, day, car_id in pending)
+            if pairs:
+                _write(pairs, _totals(pairs))
+
+        for i in range(0, len(pending_ids), BATCH_SIZE):
+            db.session.execute(
+                delete(RollupPending).where(RollupPending.id.in_(pending_ids[i:i + BATCH_SIZE]))
+            )
+
+        if watermark is None:
+            db.session.add(RollupWatermark(name=WATERMARK, watermark=started_at))
+        else:
+            watermark.watermark = started_at
+
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    analytics_cache.invalidate("daily")
+    return len(pairs)
@@ -0,0 +1,26 @@
+import threading
+
+
+class PeriodicJob(threading.Thread):
+    """
+    Runs `func` inside an app context every `interval` seconds on a
+    daemon thread.
+    """
+
+    def __init__(self, app, interval, func, name=None):
+        super().__init__(name=name or func.__name__, daemon=True)
+        self.app = app
+        self.interval = interval
+        self.func = func
+        self._stopped = threading.Event()
+
+    def run(self):
+        while not self._stopped.wait(self.interval):
+            with self.app.app_context():
+                try:
+                    self.func()
+                except Exception:
+                    self.app.logger.exception("Periodic job %s failed", self.name)
+
+    def stop(self):
+        self._stopped.set()
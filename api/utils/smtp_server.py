@@ -1,8 +1,8 @@
-import smtplib
-import random
 import os
 from email.message import EmailMessage
 from dotenv import load_dotenv
+from .mailer import mailer
+from .otp_store import create_otp_store
 
 load_dotenv()
 
@@ -12,28 +12,26 @@ class OTP:
         self.SMTP_PORT = int(os.getenv("SMTP_PORT"))
         self.GMAIL_USERNAME = os.getenv("GMAIL_USERNAME")
         self.PASSWORD = os.getenv("PASSWORD")
-        # self.otp = 0
+        self.store = create_otp_store()
 
-    def generate_otp(self):
-        self.otp = random.randint(111111, 999999)
-        return self.otp
+    def generate_otp(self, key):
+        return self.store.issue(key)
     
     def clean_str(self, s):
         return s.encode('utf-8', 'ignore').decode('utf-8')
 
-    def send_otp(self, to_email):
+    def send_otp(self, to_email, otp):
+        """
+        Queue the OTP email for background delivery.
+        Raises MailQueueFull when the outbound queue is at capacity.
+        """
         msg = EmailMessage()
         msg['Subject'] = self.clean_str("OTP Verification")
         msg['From'] = self.clean_str(self.GMAIL_USERNAME)
         msg['To'] = self.clean_str(to_email)
-        msg.set_content(f"Your OTP Code: {self.otp}", charset="utf-8")
+        msg.set_content(f"Your OTP Code: {otp}", charset="utf-8")
 
-        with smtplib.SMTP(self.SMTP_SERVER, self.SMTP_PORT) as server:
-            server.ehlo()
-            server.starttls()
-            server.ehlo()
-            server.login(self.GMAIL_USERNAME, self.PASSWORD)
-            server.send_message(msg)
+        mailer.send(msg)
         
-    def validate_otp(self, r_otp):
-        return str(self.otp) == str(r_otp)
\ No newline at end of file
+    def validate_otp(self, key, r_otp):
+        return self.store.verify(key, r_otp)
\ No newline at end of file
@@ -0,0 +1,44 @@
+from datetime import datetime
+from flask import abort
+from sqlalchemy import event
+from ..database import RoutingSession
+from ..models import Booking, Car, Notification, Tombstone
+from .helpers import encode_cursor, decode_cursor
+from .http_status_codes import *
+
+# model -> (primary key, attribute holding the owning user, None for shared rows)
+SYNCED = {
+    Car: ("car_id", None),
+    Booking: ("booking_id", "customer_id"),
+    Notification: ("notification_id", "u_id"),
+}
+
+
+@event.listens_for(RoutingSession, "before_flush")
+def record_tombstones(session, flush_context, instances):
+    """
+    Keep a tombstone for every deleted synced row, in the same transaction
+    as the delete.
+    """
+    for obj in list(session.deleted):
+        synced = SYNCED.get(type(obj))
+        if synced is None:
+            continue
+
+        primary_key, scope = synced
+        session.add(Tombstone(
+            table_name=obj.__tablename__,
+            row_id=getattr(obj, primary_key),
+            scope_id=getattr(obj, scope) if scope else None,
+        ))
+
+
+def encode_sync_token(timestamp):
+    return encode_cursor(timestamp.isoformat())
+
+
+def decode_sync_token(token):
+    try:
+        return datetime.fromisoformat(decode_cursor(token))
+    except ValueError:
+        abort(HTTP_400_BAD_REQUEST, description="Invalid sync token")
@@ -0,0 +1,183 @@
+import os
+import time
+import threading
+from collections import OrderedDict
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+class LocalBackend:
+    """
+    Dict-backed backend. State is private to the current process, so it
+    is only suitable for a single worker and for tests.
+
+    Like RedisBackend, a valid state never replaces a cached revoked one.
+    """
+
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+
+            revoked, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+
+            return revoked
+
+    def set(self, key, revoked, ttl):
+        with self._lock:
+            entry = self._data.get(key)
+            if not revoked and entry is not None and entry[1] >= time.monotonic():
+                return
+            self._data[key] = (revoked, time.monotonic() + ttl)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+
+class RedisBackend:
+    """
+    Shares revocation state between workers through redis.
+
+    The valid state is only written when the key is missing (SET NX): a
+    check that read the database before a concurrent revoke must not
+    overwrite the revoked state that revoke just cached.
+    """
+
+    def __init__(self, url):
+        import redis
+
+        self._client = redis.Redis.from_url(url)
+
+    def get(self, key):
+        value = self._client.get(f"revocation:{key}")
+        if value is None:
+            return None
+        return value == b"1"
+
+    def set(self, key, revoked, ttl):
+        if revoked:
+            self._client.set(f"revocation:{key}", "1", ex=max(int(ttl), 1))
+        else:
+            self._client.set(f"revocation:{key}", "0", ex=max(int(ttl), 1), nx=True)
+
+    def delete(self, key):
+        self._client.delete(f"revocation:{key}")
+
+
+class RevocationCache:
+    """
+    Bounded LRU/TTL cache of refresh token revocation states in front of
+    the token_blocklist table.
+
+    Revocation is permanent, so revoked entries are kept until their TTL
+    expires. Valid entries are never kept in the local LRU: a revoke on
+    another worker would be missed until they expired. They are only cached
+    in the shared backend, which every worker's revoke writes through to.
+    Without a backend every valid token is checked against the database.
+    """
+
+    def __init__(self, backend=None, max_size=10000, valid_ttl=30, revoked_ttl=3600):
+        self.backend = backend
+        self.max_size = max_size
+        self.valid_ttl = valid_ttl
+        self.revoked_ttl = revoked_ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(jti, user_id):
+        return f"{user_id}:{jti}"
+
+    def _get_local(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            revoked, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return revoked
+
+    def _set_local(self, key, revoked, ttl):
+        with self._lock:
+            self._entries[key] = (revoked, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def get(self, jti, user_id):
+        """
+        Returns True/False for a known token, None on a cache miss.
+        """
+        key = self._key(jti, user_id)
+
+        revoked = self._get_local(key)
+        if revoked is not None or self.backend is None:
+            return revoked
+
+        revoked = self.backend.get(key)
+        if revoked:
+            self._set_local(key, True, self.revoked_ttl)
+        return revoked
+
+    def set(self, jti, user_id, revoked):
+        key = self._key(jti, user_id)
+        ttl = self.revoked_ttl if revoked else self.valid_ttl
+
+        if revoked:
+            self._set_local(key, True, ttl)
+        else:
+            self.invalidate_local(key)
+
+        if self.backend is not None:
+            self.backend.set(key, revoked, ttl)
+
+    def invalidate_local(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def invalidate(self, jti, user_id):
+        key = self._key(jti, user_id)
+        self.invalidate_local(key)
+
+        if self.backend is not None:
+            self.backend.delete(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+def create_revocation_cache():
+    url = os.getenv("REVOCATION_CACHE_URL")
+
+    if not url:
+        backend = None
+    elif url == "memory://":
+        backend = LocalBackend()
+    else:
+        backend = RedisBackend(url)
+
+    return RevocationCache(
+        backend=backend,
+        max_size=int(os.getenv("REVOCATION_CACHE_SIZE", 10000)),
+        valid_ttl=int(os.getenv("REVOCATION_CACHE_VALID_TTL", 30)),
+        revoked_ttl=int(os.getenv("REVOCATION_CACHE_REVOKED_TTL", 3600)),
+    )
+
+
+revocation_cache = create_revocation_cache()
@@ -0,0 +1,61 @@
+"""
+Creating 1,000 cars one POST /cars at a time (before) and with one
+POST /cars/bulk (after), on a SQLite file so every commit is written to
+disk. On a networked database each per-row request also pays its round
+trips, which widens the gap.
+"""
+import os
+import tempfile
+import time
+
+os.environ.setdefault(
+    "SQLALCHEMY_DATABASE_URI", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+)
+
+from .common import create_bench_app
+from flask_jwt_extended import create_access_token
+from api.database import db
+from api.models import Car
+
+CARS = 1000
+
+
+def car(i, run):
+    return {
+        "license_no": f"{run}-{i:05}", "make": "Make", "model": "Model", "seats": 4, "doors": 4,
+        "description": "Bench car", "features": ["gps"], "price_per_day": 10.0, "availability_status": True,
+        "condition": "good",
+    }
+
+
+def main():
+    app = create_bench_app(0)
+    client = app.test_client()
+    client.set_cookie(
+        "access_token_cookie",
+        create_access_token(identity="EMP_0", additional_claims={"role": "employee"}),
+    )
+
+    def one_by_one():
+        for i in range(CARS):
+            assert client.post("/api/v1/cars/", json=car(i, "ONE")).status_code == 201
+
+    def bulk():
+        assert client.post("/api/v1/cars/bulk", json=[car(i, "BULK") for i in range(CARS)]).status_code == 201
+
+    results = {}
+    for label, func in (("POST /cars per car (before)", one_by_one), ("POST /cars/bulk (after)", bulk)):
+        started, cpu_started = time.perf_counter(), time.process_time()
+        func()
+        results[label] = (time.process_time() - cpu_started) * 1000, time.perf_counter() - started
+
+    assert db.session.query(Car).filter(Car.license_no != "ABC-0").count() == 2 * CARS
+
+    print(f"Creating {CARS} cars")
+    baseline = next(iter(results.values()))[1]
+    for label, (cpu, wall) in results.items():
+        print(f"  {label:<32} {wall * 1000:9.1f} ms wall  {cpu:9.1f} ms CPU  {CARS / wall:9.0f} cars/s  {baseline / wall:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""
+Serializing a get_bookings sized payload (5,000 bookings with their car,
+datetimes, floats and the features JSON column) into a response with
+Flask's default provider (before) and FastJSONProvider (after).
+"""
+from .common import create_bench_app, measure, report
+from datetime import datetime
+from flask.json.provider import DefaultJSONProvider
+from flask_jwt_extended import create_access_token
+from api.utils.json_provider import FastJSONProvider
+
+ROWS = 5000
+
+
+def main():
+    app = create_bench_app(ROWS)
+    client = app.test_client()
+    client.set_cookie("access_token_cookie", create_access_token(identity="USER_0"))
+    payload = client.get(f"/api/v1/bookings/?limit={ROWS}").get_json()
+
+    # Put the datetimes back, as the handler hands them to the provider
+    for booking in payload["data"]:
+        for key in ("booked_at", "ends_at", "updated_at"):
+            booking[key] = datetime.fromisoformat(booking[key])
+
+    results = {}
+    with app.test_request_context():
+        for label, provider in (
+            ("DefaultJSONProvider (before)", DefaultJSONProvider(app)),
+            ("FastJSONProvider (after)", FastJSONProvider(app)),
+        ):
+            results[label] = measure(lambda: provider.response(payload))
+
+    report(f"Response of {ROWS} bookings", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Listing 10,000 bookings as dicts: hydrated ORM objects with the old
+reflective as_dict (before), hydrated objects with the precompiled
+serializer, and Row tuples from get_columns with serialize_rows (after).
+"""
+from .common import create_bench_app, measure, report
+from api.database import db
+from api.models import Booking
+from api.serializers import get_columns, get_fields, serialize, serialize_rows
+
+ROWS = 10000
+
+
+def reflective_as_dict(obj):
+    # What every model's as_dict did before the serializer registry
+    return {c.name: getattr(obj, c.name) for c in obj.__table__.columns}
+
+
+def main():
+    create_bench_app(ROWS)
+
+    def orm_reflective():
+        db.session.expunge_all()
+        return [reflective_as_dict(booking) for booking in db.session.query(Booking).all()]
+
+    def orm_serialize():
+        db.session.expunge_all()
+        return [serialize(booking) for booking in db.session.query(Booking).all()]
+
+    def rows_serialize():
+        return serialize_rows(db.session.query(*get_columns(Booking)).all(), get_fields(Booking))
+
+    assert orm_reflective() == rows_serialize()
+
+    report(f"{ROWS} bookings as dicts", {
+        "ORM + reflective as_dict (before)": measure(orm_reflective),
+        "ORM + precompiled serialize": measure(orm_serialize),
+        "Row tuples + serialize_rows (after)": measure(rows_serialize),
+    })
+
+    bookings = db.session.query(Booking).all()
+    report(f"Serializing {ROWS} loaded bookings only", {
+        "reflective as_dict (before)": measure(lambda: [reflective_as_dict(b) for b in bookings]),
+        "precompiled serialize (after)": measure(lambda: [serialize(b) for b in bookings]),
+    })
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+GET /bookings with a 5,000 row page, with the response validated against
+its schema (VALIDATE_RESPONSES, what every request paid before) and
+serialized once without it (production). Measured for the whole request
+and for the response stage alone, on the payload the handler built.
+"""
+from .common import create_bench_app, measure, report
+from flask import jsonify
+from flask_jwt_extended import create_access_token
+from api.schemas import BookingResponse
+
+ROWS = 5000
+
+
+def main():
+    app = create_bench_app(ROWS)
+    client = app.test_client()
+    client.set_cookie("access_token_cookie", create_access_token(identity="USER_0"))
+    url = f"/api/v1/bookings/?limit={ROWS}"
+
+    def get_bookings():
+        response = client.get(url)
+        assert response.status_code == 200
+
+    results = {}
+    for label, validate in (("validated (before)", True), ("serialized once (after)", False)):
+        app.config["VALIDATE_RESPONSES"] = validate
+        results[label] = measure(get_bookings)
+    report(f"GET {url}, whole request", results)
+
+    payload = client.get(url).get_json()
+
+    def validate_and_serialize():
+        BookingResponse.model_validate(payload)
+        jsonify(payload)
+
+    with app.test_request_context(url):
+        report("Response stage only", {
+            "validated (before)": measure(validate_and_serialize),
+            "serialized once (after)": measure(lambda: jsonify(payload)),
+        })
+
+
+if __name__ == "__main__":
+    main()
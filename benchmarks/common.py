@@ -0,0 +1,93 @@
+"""
+Shared setup for the benchmark scripts: an app on an in-memory SQLite
+database seeded with bookings, and a timer reporting CPU time and peak
+allocations per call.
+
+Run a benchmark from the repository root, e.g.
+`python -m benchmarks.bench_validation`. Benchmarks import this module
+before anything from `api`, it sets the environment the app reads.
+"""
+import gc
+import os
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+os.environ.setdefault("SQLALCHEMY_DATABASE_URI", "sqlite://")
+os.environ.setdefault("SECRET_KEY", "bench")
+os.environ.setdefault("JWT_SECRET_KEY", "bench")
+os.environ.setdefault("SMTP_SERVER", "localhost")
+os.environ.setdefault("SMTP_PORT", "25")
+os.environ.setdefault("JOB_RESUME_INTERVAL", "0")
+os.environ.setdefault(
+    "AZURE_CONN_STRING",
+    "DefaultEndpointsProtocol=https;AccountName=bench;AccountKey=YmVuY2g=;EndpointSuffix=core.windows.net",
+)
+
+from sqlalchemy import insert
+from api import create_app
+from api.database import db
+from api.models import Booking, Car, Customer, User
+
+
+def create_bench_app(bookings):
+    """
+    An app whose database holds `bookings` bookings of one car. Returns
+    the app with an app context pushed.
+    """
+    app = create_app()
+    app.config["MAX_PAGE_SIZE"] = bookings
+    app.app_context().push()
+    db.create_all()
+
+    db.session.add(User(u_id="USER_0", username="customer", password="x", role="customer"))
+    db.session.add(Customer(customer_id="USER_0", name="Customer", nic="0", email="c@example.com"))
+    db.session.add(Car(
+        car_id="CAR_0", license_no="ABC-0", make="Make", model="Model", seats=4,
+        doors=4, price_per_day=10.0, condition="good", features=["gps"], description="Bench car",
+    ))
+    start = datetime(2026, 1, 1)
+    if bookings:
+        db.session.execute(insert(Booking), [
+            {
+                "booking_id": f"BK_{i:06}", "customer_id": "USER_0", "car_id": "CAR_0",
+                "booked_at": start + timedelta(hours=i), "time_period": 1,
+                "ends_at": start + timedelta(hours=i, days=1), "status": "booked",
+                "fine": 0.0, "total": 10.0, "updated_at": start,
+            }
+            for i in range(bookings)
+        ])
+    db.session.commit()
+    return app
+
+
+def measure(func, repeat=5):
+    """
+    Run `func` `repeat` times and return (CPU ms per call, peak KiB
+    allocated by one call), the best of the runs for each.
+    """
+    func()  # warm up caches and compiled statements
+
+    cpu = []
+    for _ in range(repeat):
+        gc.collect()
+        started = time.process_time()
+        func()
+        cpu.append((time.process_time() - started) * 1000)
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return min(cpu), peak / 1024
+
+
+def report(title, results):
+    """
+    Print {label: (cpu ms, peak KiB)} as a table, the first row is the baseline.
+    """
+    print(title)
+    baseline = next(iter(results.values()))[0]
+    for label, (cpu, peak) in results.items():
+        print(f"  {label:<36} {cpu:9.1f} ms CPU  {peak:10.0f} KiB peak  {baseline / cpu:5.1f}x")
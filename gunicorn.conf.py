@@ -0,0 +1,23 @@
+"""
+Production server settings, run with:
+
+    gunicorn -c gunicorn.conf.py "api:create_app()"
+
+Every client of GET /api/v1/notifications/stream keeps a thread for as
+long as it stays connected, so the workers are threaded (gthread) and have
+far more threads than the rest of the API needs. Size GUNICORN_THREADS
+for the open streams you expect per worker plus headroom for ordinary
+requests. With more than one worker, set PUBSUB_URL to a redis URL so every
+worker sees every notification.
+"""
+import os
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", 2))
+worker_class = "gthread"
+# One per open stream plus the ones serving ordinary requests
+threads = int(os.getenv("GUNICORN_THREADS", 200))
+# gthread only uses this for the worker heartbeat, streams may outlive it
+timeout = 30
+# Streams end on restart, clients reconnect after the `retry:` delay
+graceful_timeout = 10
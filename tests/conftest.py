@@ -0,0 +1,71 @@
+import os
+
+os.environ.setdefault("SQLALCHEMY_DATABASE_URI", "sqlite://")
+os.environ.setdefault("SECRET_KEY", "test")
+os.environ.setdefault("JWT_SECRET_KEY", "test")
+os.environ.setdefault("SMTP_SERVER", "localhost")
+os.environ.setdefault("SMTP_PORT", "25")
+# Tests resume jobs explicitly
+os.environ.setdefault("JOB_RESUME_INTERVAL", "0")
+os.environ.setdefault(
+    "AZURE_CONN_STRING",
+    "DefaultEndpointsProtocol=https;AccountName=test;AccountKey=dGVzdA==;EndpointSuffix=core.windows.net",
+)
+
+import pytest
+from contextlib import contextmanager
+from sqlalchemy import event
+from flask_jwt_extended import create_access_token
+from api import create_app
+from api.database import db
+
+
+@pytest.fixture
+def app():
+    app = create_app()
+    app.config["TESTING"] = True
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def login(client):
+    """
+    Put an access token for `u_id` with `role` in the client's cookies.
+    """
+    def login(u_id, role="employee"):
+        token = create_access_token(identity=u_id, additional_claims={"role": role})
+        client.set_cookie("access_token_cookie", token)
+        return client
+
+    return login
+
+
+@pytest.fixture
+def count_queries(app):
+    """
+    Context manager collecting the SQL statements run on the primary.
+    """
+    @contextmanager
+    def count_queries():
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(db.engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            yield statements
+        finally:
+            event.remove(db.engine, "before_cursor_execute", before_cursor_execute)
+
+    return count_queries
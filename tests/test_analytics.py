@@ -0,0 +1,33 @@
+from datetime import datetime, timedelta
+from api.database import db
+from api.models import Booking, Car, Customer, User
+
+
+def add_booking(booking_id, booked_at, days):
+    db.session.add(Booking(
+        booking_id=booking_id, customer_id="USER_0", car_id="CAR_0", booked_at=booked_at,
+        time_period=days, ends_at=Booking.compute_ends_at(booked_at, days), status="booked",
+    ))
+
+
+def test_utilisation_counts_the_days_inside_the_period(app, login):
+    db.session.add(User(u_id="USER_0", username="customer", password="x", role="customer"))
+    db.session.add(Customer(customer_id="USER_0", name="Customer", nic="0", email="c@example.com"))
+    db.session.add(Car(
+        car_id="CAR_0", license_no="ABC-0", make="Make", model="Model", seats=4,
+        doors=4, price_per_day=10.0, condition="good",
+    ))
+    start = datetime(2026, 9, 1)
+    # 2 days before the period, 3 inside
+    add_booking("BK_0", start - timedelta(days=2), 5)
+    # 4 days inside, 6 after the period
+    add_booking("BK_1", start + timedelta(days=6), 10)
+    db.session.commit()
+
+    response = login("EMP_0").get("/api/v1/analytics/utilisation?start=2026-09-01&end=2026-09-11")
+
+    assert response.status_code == 200
+    [row] = response.get_json()["data"]
+    assert row["bookings"] == 2
+    assert row["booked_days"] == 7
+    assert row["utilisation"] == 0.7
@@ -0,0 +1,143 @@
+import os
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event
+from api import create_app
+from api.config import Config, engine_options
+from api.database import db
+from api.models import Booking, Car, Customer, User
+
+
+def add_booking(booking_id, status, booked_at=datetime(2026, 10, 1), time_period=3):
+    booking = Booking(
+        booking_id=booking_id,
+        customer_id="USER_0",
+        car_id="CAR_0",
+        booked_at=booked_at,
+        time_period=time_period,
+        ends_at=Booking.compute_ends_at(booked_at, time_period),
+        status=status,
+    )
+    db.session.add(booking)
+    db.session.commit()
+    return booking
+
+
+def setup_car():
+    db.session.add(User(u_id="USER_0", username="customer", password="x", role="customer"))
+    db.session.add(Customer(customer_id="USER_0", name="Customer", nic="0", email="c@example.com"))
+    db.session.add(Car(
+        car_id="CAR_0", license_no="ABC-0", make="Make", model="Model", seats=4,
+        doors=4, price_per_day=10.0, condition="good",
+    ))
+    db.session.commit()
+
+
+def test_reactivating_a_canceled_booking_checks_for_overlap(app, login):
+    setup_car()
+    add_booking("BK_0", "canceled")
+    add_booking("BK_1", "booked")
+    client = login("USER_0", "customer")
+
+    response = client.put("/api/v1/bookings/BK_0", json={"status": "booked"})
+
+    assert response.status_code == 409
+    assert db.session.get(Booking, "BK_0").status == "canceled"
+
+
+def test_reactivating_a_canceled_booking_without_overlap(app, login):
+    setup_car()
+    add_booking("BK_0", "canceled")
+    add_booking("BK_1", "booked", booked_at=datetime(2026, 10, 10))
+    client = login("USER_0", "customer")
+
+    response = client.put("/api/v1/bookings/BK_0", json={"status": "booked"})
+
+    assert response.status_code == 200
+    db.session.expire_all()
+    assert db.session.get(Booking, "BK_0").status == "booked"
+
+
+def test_extending_a_booking_into_another_is_rejected(app, login):
+    setup_car()
+    add_booking("BK_0", "booked")
+    add_booking("BK_1", "booked", booked_at=datetime(2026, 10, 5))
+    client = login("USER_0", "customer")
+
+    response = client.put("/api/v1/bookings/BK_0", json={"time_period": 7})
+
+    assert response.status_code == 409
+
+
+REQUESTS_PER_WINDOW = 50
+WINDOWS = [datetime(2026, 11, 1) + timedelta(days=7 * i) for i in range(4)]
+
+
+@pytest.fixture
+def concurrent_app(monkeypatch, tmp_path):
+    """
+    The app on a database shared by several connections: the MySQL URL in
+    TEST_MYSQL_URL, or a SQLite file. SQLite has no FOR UPDATE, so every
+    transaction starts with BEGIN IMMEDIATE, which takes the database write
+    lock the way the car row lock serializes bookings on MySQL.
+    """
+    uri = os.getenv("TEST_MYSQL_URL") or f"sqlite:///{tmp_path / 'bookings.db'}"
+    monkeypatch.setattr(Config, "SQLALCHEMY_DATABASE_URI", uri)
+    monkeypatch.setattr(Config, "SQLALCHEMY_ENGINE_OPTIONS", engine_options(uri))
+    app = create_app()
+
+    with app.app_context():
+        if db.engine.dialect.name == "sqlite":
+            @event.listens_for(db.engine, "connect")
+            def connect(dbapi_connection, _):
+                # Let SQLAlchemy emit BEGIN, and wait for the lock instead of failing
+                dbapi_connection.isolation_level = None
+                dbapi_connection.execute("PRAGMA busy_timeout = 30000")
+
+            @event.listens_for(db.engine, "begin")
+            def begin(connection):
+                connection.exec_driver_sql("BEGIN IMMEDIATE")
+
+            db.engine.dispose()
+
+        db.create_all()
+        setup_car()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+def test_parallel_bookings_of_one_car_never_overlap(concurrent_app):
+    token = create_access_token(identity="USER_0", additional_claims={"role": "customer"})
+
+    def book(booked_at):
+        client = concurrent_app.test_client()
+        client.set_cookie("access_token_cookie", token)
+        response = client.post("/api/v1/bookings/", json={
+            "customer_id": "USER_0",
+            "car_id": "CAR_0",
+            "booked_at": booked_at.isoformat(),
+            "time_period": 3,
+            "status": "booked",
+        })
+        return booked_at, response.status_code
+
+    attempts = [
+        window + timedelta(hours=i % 24)
+        for window in WINDOWS
+        for i in range(REQUESTS_PER_WINDOW)
+    ]
+    with ThreadPoolExecutor(max_workers=32) as executor:
+        results = list(executor.map(book, attempts))
+
+    assert {status for _, status in results} == {201, 409}
+    for window in WINDOWS:
+        created = [at for at, status in results if status == 201 and window <= at < window + timedelta(days=1)]
+        assert len(created) == 1, window
+
+    bookings = sorted(db.session.query(Booking).all(), key=lambda booking: booking.booked_at)
+    assert len(bookings) == len(WINDOWS)
+    for earlier, later in zip(bookings, bookings[1:]):
+        assert earlier.ends_at <= later.booked_at
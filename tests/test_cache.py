@@ -0,0 +1,38 @@
+from flask import Flask
+from api.database import wants_replica
+from api.utils.cache import ResponseCache, cached_response
+
+
+def test_misses_are_rendered_from_the_primary():
+    app = Flask(__name__)
+    cache = ResponseCache()
+    seen = []
+
+    @app.get("/cars")
+    @cached_response(cache, tags=lambda: ("cars",))
+    def get_cars():
+        seen.append(wants_replica())
+        return {"data": []}, 200
+
+    with app.test_request_context("/cars"):
+        assert wants_replica()
+
+    client = app.test_client()
+    assert client.get("/cars").status_code == 200
+    cache.invalidate("cars")
+    assert client.get("/cars").status_code == 200
+    assert seen == [False, False]
+
+
+def test_private_caches_are_not_stored_by_proxies():
+    app = Flask(__name__)
+    cache = ResponseCache(public=False)
+
+    @app.get("/report")
+    @cached_response(cache, tags=lambda: ("report",))
+    def get_report():
+        return {"data": []}, 200
+
+    response = app.test_client().get("/report")
+    assert response.cache_control.private
+    assert not response.cache_control.public
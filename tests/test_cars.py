@@ -0,0 +1,35 @@
+from sqlalchemy import event, false, select
+from api.database import RoutingSession, db
+from api.models import Car
+
+
+def car(license_no):
+    return {
+        "license_no": license_no, "make": "Make", "model": "Model", "seats": 4, "doors": 4,
+        "price_per_day": 10.0, "condition": "good", "features": [], "description": "", "availability_status": True,
+    }
+
+
+def test_bulk_create_reports_cars_taken_by_a_concurrent_request(app, login):
+    db.session.add(Car(car_id="CAR_0", **car("ABC-1")))
+    db.session.commit()
+
+    checks = []
+
+    @event.listens_for(RoutingSession, "do_orm_execute")
+    def miss_first_check(orm_execute_state):
+        # The first uniqueness check ran before the other request committed ABC-1
+        statement = orm_execute_state.statement
+        if not checks and orm_execute_state.is_select and "license_no" in str(statement):
+            checks.append(statement)
+            return orm_execute_state.invoke_statement(statement=select(Car.license_no).where(false()))
+
+    try:
+        response = login("EMP_0").post("/api/v1/cars/bulk", json=[car("ABC-0"), car("ABC-1"), car("ABC-2")])
+    finally:
+        event.remove(RoutingSession, "do_orm_execute", miss_first_check)
+
+    assert checks
+    assert response.status_code == 207
+    assert [result["status"] for result in response.get_json()["data"]] == ["success", "error", "success"]
+    assert db.session.query(Car).count() == 3
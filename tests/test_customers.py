@@ -0,0 +1,36 @@
+from api.database import db
+from api.models import Customer, User
+
+
+def add_customers(count):
+    for i in range(count):
+        db.session.add(User(u_id=f"USER_{i:02}", username=f"customer{i}", password="x", role="customer"))
+        db.session.add(Customer(customer_id=f"USER_{i:02}", name=f"Customer {i}", nic=str(i), email=f"c{i}@example.com"))
+    db.session.commit()
+    db.session.expunge_all()
+
+
+def test_listing_customers_runs_one_query(app, login, count_queries):
+    add_customers(20)
+    client = login("USER_00", "employee")
+
+    with count_queries() as statements:
+        response = client.get("/api/v1/customers/?limit=20")
+
+    assert response.status_code == 200
+    assert len(response.get_json()["data"]) == 20
+    assert all("updated_at" in customer["user"] for customer in response.get_json()["data"])
+    assert len(statements) == 1
+
+
+def test_projection_always_includes_the_primary_key(app, login):
+    add_customers(2)
+    client = login("USER_00", "employee")
+
+    response = client.get("/api/v1/customers/?fields=name")
+
+    assert response.status_code == 200
+    assert response.get_json()["data"] == [
+        {"customer_id": "USER_00", "name": "Customer 0"},
+        {"customer_id": "USER_01", "name": "Customer 1"},
+    ]
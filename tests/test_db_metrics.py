@@ -0,0 +1,38 @@
+from sqlalchemy import create_engine, text
+from api.config import engine_options
+from api.utils.db_metrics import EngineMetrics, InstrumentedQueuePool
+
+
+def engine():
+    # engine_options leaves SQLite on its default pool, so build the pool directly
+    return create_engine("sqlite://", poolclass=InstrumentedQueuePool, pool_size=2, max_overflow=0)
+
+
+def test_metrics_are_kept_per_engine():
+    primary, replica = engine(), engine()
+    metrics = EngineMetrics()
+    metrics.install("primary", primary)
+    metrics.install("replica_0", replica)
+
+    for _ in range(3):
+        with replica.connect() as connection:
+            connection.execute(text("SELECT 1"))
+
+    snapshot = metrics.snapshot()
+
+    assert snapshot["primary"]["checkouts"] == 0
+    assert snapshot["primary"]["max_wait_ms"] == 0.0
+    assert snapshot["replica_0"]["checkouts"] == 3
+
+
+def test_recreated_pool_keeps_recording_waits():
+    primary = engine()
+    metrics = EngineMetrics()
+    metrics.install("primary", primary)
+
+    primary.dispose()
+    assert primary.pool.metrics is not None
+
+
+def test_mysql_binds_use_the_instrumented_pool():
+    assert engine_options("mysql+pymysql://user@db/app")["poolclass"] is InstrumentedQueuePool
@@ -0,0 +1,16 @@
+from api.utils.explain import ROUTES, find_full_scans, route_queries
+
+
+def test_route_queries_are_the_paginated_ones(app):
+    with app.app_context():
+        queries = route_queries()
+
+    assert set(queries) == set(ROUTES)
+    for route, statements in queries.items():
+        assert statements, route
+        assert any("ORDER BY" in sql and "LIMIT" in sql for sql, _ in statements), route
+
+
+def test_filtered_routes_use_an_index(app):
+    with app.app_context():
+        assert find_full_scans() == {}
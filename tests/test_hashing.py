@@ -0,0 +1,27 @@
+import os
+import signal
+from api.utils.hashing import HashingPool
+
+
+def test_hashing_recovers_from_a_dead_worker():
+    pool = HashingPool(max_workers=1, queue_depth=1, timeout=60, rounds=4)
+    try:
+        hashed = pool.hash("secret")
+        assert pool.verify("secret", hashed)
+
+        for process in list(pool._executor._processes.values()):
+            os.kill(process.pid, signal.SIGKILL)
+            process.join()
+
+        assert pool.verify("secret", hashed)
+        assert pool.metrics()["in_flight"] == 0
+    finally:
+        pool.shutdown()
+
+
+def test_workers_are_spawned():
+    pool = HashingPool(max_workers=1, queue_depth=1, timeout=60, rounds=4)
+    try:
+        assert pool._get_executor()._mp_context.get_start_method() == "spawn"
+    finally:
+        pool.shutdown()
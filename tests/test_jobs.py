@@ -0,0 +1,66 @@
+from datetime import datetime, timedelta
+from api.database import db
+from api.models import Job, Notification, User
+from api.utils.jobs import job_registry
+
+
+def add_users(count):
+    for i in range(count):
+        db.session.add(User(u_id=f"USER_{i:02}", username=f"user{i}", password="x", role="customer"))
+    db.session.commit()
+
+
+def run_inline(monkeypatch, app):
+    # Run jobs on the test thread, the in-memory database has one connection
+    monkeypatch.setattr(job_registry, "_spawn", lambda app, job_id: job_registry._run(app, job_id))
+
+
+def test_broadcast_progress_is_visible_to_every_worker(app, login, monkeypatch):
+    run_inline(monkeypatch, app)
+    add_users(5)
+    app.config["BROADCAST_CHUNK_SIZE"] = 2
+    client = login("USER_00", "employee")
+
+    response = client.post("/api/v1/notifications/broadcast", json={"text": "Hello", "role": "customer"})
+    assert response.status_code == 202
+    job_id = response.get_json()["data"]["job_id"]
+
+    job = client.get(f"/api/v1/notifications/broadcast/{job_id}").get_json()["data"]
+    assert (job["status"], job["processed"], job["total"]) == ("done", 5, 5)
+    assert db.session.get(Job, job_id).cursor == "USER_04"
+
+
+def test_interrupted_broadcast_resumes_from_its_cursor(app, monkeypatch):
+    run_inline(monkeypatch, app)
+    add_users(5)
+    # A worker died after committing the chunk up to USER_01
+    for u_id in ("USER_00", "USER_01"):
+        db.session.add(Notification(notification_id=f"N_{u_id}", u_id=u_id, text="Hello"))
+    db.session.add(Job(
+        job_id="JOB_0", name="broadcast-notifications", status="running",
+        params={"text": "Hello", "role": None, "chunk_size": 2},
+        cursor="USER_01", total=5, processed=2,
+        heartbeat_at=datetime.now() - timedelta(minutes=10),
+    ))
+    db.session.commit()
+
+    assert job_registry.resume_stale(app, stale_after=300) == 1
+
+    db.session.expire_all()
+    job = db.session.get(Job, "JOB_0")
+    assert (job.status, job.processed, job.cursor) == ("done", 5, "USER_04")
+    counts = dict(
+        db.session.query(Notification.u_id, db.func.count()).group_by(Notification.u_id).all()
+    )
+    assert counts == {f"USER_{i:02}": 1 for i in range(5)}
+
+
+def test_live_jobs_are_not_resumed(app, monkeypatch):
+    run_inline(monkeypatch, app)
+    db.session.add(Job(
+        job_id="JOB_0", name="broadcast-notifications", status="running",
+        params={"text": "Hello", "role": None, "chunk_size": 2},
+    ))
+    db.session.commit()
+
+    assert job_registry.resume_stale(app, stale_after=300) == 0
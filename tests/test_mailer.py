@@ -0,0 +1,106 @@
+import smtplib
+import time
+from email.message import EmailMessage
+from api.utils.mailer import Mailer
+
+
+class FakeServer:
+    def __init__(self, refused=(), busy=(), disconnect_on=()):
+        self.refused = set(refused)
+        self.busy = set(busy)
+        self.disconnect_on = set(disconnect_on)
+        self.sent = []
+
+    def send_message(self, message):
+        if message["To"] in self.disconnect_on:
+            raise smtplib.SMTPServerDisconnected("gone")
+        if message["To"] in self.refused:
+            raise smtplib.SMTPRecipientsRefused({message["To"]: (550, b"no such user")})
+        if message["To"] in self.busy:
+            raise smtplib.SMTPRecipientsRefused({message["To"]: (451, b"try again later")})
+        self.sent.append(message["To"])
+
+
+class FakePool:
+    def __init__(self, server):
+        self.server = server
+        self.released = []
+        self.discarded = []
+
+    def acquire(self):
+        return self.server
+
+    def release(self, server):
+        self.released.append(server)
+
+    def discard(self, server):
+        self.discarded.append(server)
+
+
+def message(to):
+    message = EmailMessage()
+    message["To"] = to
+    return message
+
+
+def test_refused_recipient_keeps_the_connection():
+    server = FakeServer(busy={"b@example.com"})
+    pool = FakePool(server)
+    pending = [(message(to), 0) for to in ("a@example.com", "b@example.com", "c@example.com")]
+
+    failed = Mailer(pool)._send_over(server, pending)
+
+    assert [m["To"] for m, _ in failed] == ["b@example.com"]
+    assert server.sent == ["a@example.com", "c@example.com"]
+    assert pool.released == [server] and pool.discarded == []
+
+
+def test_dropped_connection_returns_the_rest_of_the_batch():
+    server = FakeServer(disconnect_on={"b@example.com"})
+    pool = FakePool(server)
+    pending = [(message(to), 0) for to in ("a@example.com", "b@example.com", "c@example.com")]
+
+    failed = Mailer(pool)._send_over(server, pending)
+
+    assert [m["To"] for m, _ in failed] == ["b@example.com", "c@example.com"]
+    assert pool.discarded == [server] and pool.released == []
+
+
+def test_permanent_refusal_is_not_retried():
+    server = FakeServer(refused={"b@example.com"})
+    pool = FakePool(server)
+    pending = [(message(to), 0) for to in ("a@example.com", "b@example.com")]
+
+    assert Mailer(pool)._send_over(server, pending) == []
+    assert server.sent == ["a@example.com"]
+
+
+def test_transient_failure_waits_without_blocking_new_mail():
+    server = FakeServer(busy={"b@example.com"})
+    mailer = Mailer(FakePool(server), backoff=60)
+
+    started = time.monotonic()
+    retry = mailer._send_batch([(message("b@example.com"), 0)])
+    for item in retry:
+        mailer._schedule_retry(*item)
+    mailer._queue.put_nowait((message("c@example.com"), 0))
+
+    batch = mailer._next_batch()
+
+    assert time.monotonic() - started < 1
+    assert [(m["To"], attempt) for m, attempt in retry] == [("b@example.com", 1)]
+    assert [m["To"] for m, _ in batch] == ["c@example.com"]
+    assert 59 < mailer._until_next_retry() <= 60
+
+
+def test_due_retries_are_sent_and_finished():
+    server = FakeServer()
+    mailer = Mailer(FakePool(server), backoff=0)
+    mailer._queue.put_nowait((message("b@example.com"), 0))
+    mailer._queue.get_nowait()
+    mailer._schedule_retry(message("b@example.com"), 1)
+    mailer.start()
+
+    mailer.join()
+
+    assert server.sent == ["b@example.com"]
@@ -0,0 +1,28 @@
+from api.database import db
+from api.models import User
+from api.utils.pubsub import broker
+
+
+def test_stream_sends_retry_then_created_notifications(app, login):
+    app.config["SSE_KEEPALIVE"] = 1
+    db.session.add(User(u_id="USER_1", username="user", password="x", role="customer"))
+    db.session.commit()
+    client = login("USER_1")
+
+    response = client.get("/api/v1/notifications/stream", buffered=False)
+    assert response.status_code == 200
+    assert response.mimetype == "text/event-stream"
+
+    frames = iter(response.response)
+    assert next(frames) == b"retry: 3000\n\n"
+
+    created = client.post("/api/v1/notifications/", json={"u_id": "USER_1", "text": "Booking confirmed"})
+    assert created.status_code == 201
+
+    frame = next(frames).decode()
+    assert frame.startswith("event: notification.created\ndata: ")
+    assert created.get_json()["data"]["notification_id"] in frame
+
+    # Disconnecting drops the subscription
+    response.close()
+    assert "user:USER_1" not in broker._subscribers
@@ -0,0 +1,19 @@
+import pytest
+import redis
+from api.utils.pubsub import RedisBroker
+
+UNREACHABLE = "redis://127.0.0.1:1/0"
+
+
+def test_redis_broker_connects_lazily():
+    broker = RedisBroker(UNREACHABLE)
+    assert broker._client is None
+
+    with pytest.raises(redis.ConnectionError):
+        broker.publish("notifications:USER", "{}")
+    with pytest.raises(redis.ConnectionError):
+        broker.subscribe("notifications:USER")
+
+    # A failed connect is retried on the next call
+    assert broker._client is None
+    assert not broker._subscribers
@@ -0,0 +1,61 @@
+import pytest
+from datetime import datetime
+from api.database import db
+from api.models import Booking, Car, Customer, Service, Transaction, User
+
+ROWS = 10
+
+
+def add_rows(count):
+    for i in range(count):
+        day = datetime(2026, 10, 1 + i)
+        db.session.add(User(u_id=f"USER_{i:02}", username=f"customer{i}", password="x", role="customer"))
+        db.session.add(Customer(customer_id=f"USER_{i:02}", name=f"Customer {i}", nic=str(i), email=f"c{i}@example.com"))
+        db.session.add(Car(
+            car_id=f"CAR_{i:02}", license_no=f"ABC-{i}", make="Make", model="Model", seats=4,
+            doors=4, price_per_day=10.0, condition="good",
+        ))
+        db.session.add(Booking(
+            booking_id=f"BK_{i:02}", customer_id=f"USER_{i:02}", car_id=f"CAR_{i:02}",
+            booked_at=day, time_period=1, ends_at=Booking.compute_ends_at(day, 1), status="booked",
+        ))
+        db.session.add(Transaction(
+            transaction_id=f"TRS_{i:02}", transaction_amount=20.0, date=day,
+            customer_id=f"USER_{i:02}", car_id=f"CAR_{i:02}", booking_id=f"BK_{i:02}",
+        ))
+        for j in range(2):
+            db.session.add(Service(
+                service_id=f"SRV_{i:02}_{j}", car_id=f"CAR_{i:02}", transaction_amount=5.0,
+                service_date=day, details="Oil change",
+            ))
+    db.session.commit()
+    db.session.expunge_all()
+
+
+# url -> statements it runs, the same for one row or a full page. Cars load
+# their services with one extra selectin query
+ENDPOINTS = {
+    "/api/v1/bookings/": 1,
+    "/api/v1/bookings/BK_00": 1,
+    "/api/v1/cars/": 2,
+    "/api/v1/cars/CAR_00": 2,
+    "/api/v1/transactions/": 1,
+    "/api/v1/transactions/TRS_00": 1,
+    "/api/v1/services/": 1,
+    "/api/v1/services/SRV_00_0": 1,
+    "/api/v1/customers/": 1,
+    "/api/v1/customers/USER_00": 1,
+}
+
+
+@pytest.mark.parametrize("url", ENDPOINTS)
+def test_endpoint_query_count_does_not_grow_with_rows(app, login, count_queries, url):
+    add_rows(ROWS)
+    client = login("EMP_0", "employee")
+
+    with count_queries() as statements:
+        response = client.get(url)
+
+    assert response.status_code == 200
+    assert response.get_json()["data"]
+    assert len(statements) == ENDPOINTS[url]
@@ -0,0 +1,71 @@
+from datetime import date, datetime
+from api.database import db
+from api.models import Booking, Car, Customer, DailyCarRollup, Transaction, User
+from api.utils.rollups import refresh_daily_rollups
+
+
+def setup_rows():
+    db.session.add(User(u_id="USER_0", username="customer", password="x", role="customer"))
+    db.session.add(Customer(customer_id="USER_0", name="Customer", nic="0", email="c@example.com"))
+    db.session.add(Car(
+        car_id="CAR_0", license_no="ABC-0", make="Make", model="Model", seats=4,
+        doors=4, price_per_day=10.0, condition="good",
+    ))
+    db.session.add(Booking(
+        booking_id="BK_0_0", customer_id="USER_0", car_id="CAR_0",
+        booked_at=datetime(2026, 10, 1, 9), time_period=1, status="booked",
+    ))
+    db.session.add(Transaction(
+        transaction_id="TRS_0_0", transaction_amount=20.0, date=datetime(2026, 10, 1, 9),
+        customer_id="USER_0", car_id="CAR_0", booking_id="BK_0_0",
+    ))
+    db.session.commit()
+
+
+def rollups():
+    db.session.expire_all()
+    return {
+        row.day: (row.bookings_count, row.revenue)
+        for row in db.session.query(DailyCarRollup).filter_by(car_id="CAR_0")
+    }
+
+
+def test_bulk_update_moving_rows_recomputes_the_old_day(app):
+    setup_rows()
+    refresh_daily_rollups()
+    assert rollups() == {date(2026, 10, 1): (1, 20.0)}
+
+    moved_to = datetime(2026, 10, 3, 9)
+    db.session.query(Transaction).filter_by(transaction_id="TRS_0_0").update(
+        {"date": moved_to}, synchronize_session=False
+    )
+    db.session.query(Booking).filter_by(booking_id="BK_0_0").update(
+        {"booked_at": moved_to}, synchronize_session=False
+    )
+    db.session.commit()
+    refresh_daily_rollups()
+
+    assert rollups() == {date(2026, 10, 3): (1, 20.0)}
+
+
+def test_object_update_moving_rows_recomputes_the_old_day(app):
+    setup_rows()
+    refresh_daily_rollups()
+
+    db.session.get(Transaction, "TRS_0_0").date = datetime(2026, 10, 3, 9)
+    db.session.get(Booking, "BK_0_0").booked_at = datetime(2026, 10, 3, 9)
+    db.session.commit()
+    refresh_daily_rollups()
+
+    assert rollups() == {date(2026, 10, 3): (1, 20.0)}
+
+
+def test_deleted_rows_are_removed_from_the_rollup(app):
+    setup_rows()
+    refresh_daily_rollups()
+
+    db.session.delete(db.session.get(Transaction, "TRS_0_0"))
+    db.session.commit()
+    refresh_daily_rollups()
+
+    assert rollups() == {date(2026, 10, 1): (1, 0.0)}
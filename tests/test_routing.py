@@ -0,0 +1,62 @@
+import pytest
+from flask_jwt_extended import create_access_token
+from sqlalchemy import select
+from api import create_app
+from api.config import Config
+from api.database import db
+from api.models import OTPCode
+from api.services.auth import otp_handler
+from api.utils.otp_store import OTPStore, SQLOTPBackend
+
+
+@pytest.fixture
+def replica_app(monkeypatch):
+    # An empty replica behaves like one that hasn't caught up yet
+    monkeypatch.setattr(Config, "SQLALCHEMY_BINDS", {"replica_0": "sqlite://"})
+    monkeypatch.setattr(Config, "SQLALCHEMY_REPLICA_BINDS", ["replica_0"])
+    app = create_app()
+
+    with app.app_context():
+        db.create_all()
+        db.metadata.create_all(db.engines["replica_0"])
+        yield app
+        db.session.remove()
+        db.drop_all(bind_key=None)
+        # Flask-SQLAlchemy keeps a metadata per bind key, later apps have no replica
+        db.metadatas.pop("replica_0", None)
+
+
+def test_plain_reads_of_get_requests_use_the_replica(replica_app):
+    with replica_app.test_request_context("/"):
+        assert db.session.get_bind(clause=select(OTPCode)) is db.engines["replica_0"]
+
+
+def test_locking_reads_and_later_reads_use_the_primary(replica_app):
+    with replica_app.test_request_context("/"):
+        db.session.execute(select(OTPCode).with_for_update()).all()
+        assert db.session.get_bind(clause=select(OTPCode)) is db.engine
+
+        db.session.rollback()
+        assert db.session.get_bind(clause=select(OTPCode)) is db.engines["replica_0"]
+
+
+def test_sql_backend_check_reads_the_lock_from_the_primary(replica_app):
+    store = OTPStore(SQLOTPBackend(), max_attempts=2)
+    code = store.issue("USER")
+
+    with replica_app.test_request_context("/"):
+        assert store.verify("USER", code)
+
+
+def test_otp_endpoints_use_the_primary(replica_app, monkeypatch):
+    codes = []
+    monkeypatch.setattr(otp_handler, "store", OTPStore(SQLOTPBackend()))
+    monkeypatch.setattr(otp_handler, "send_otp", lambda email, otp: codes.append(otp))
+
+    client = replica_app.test_client()
+    client.set_cookie("access_token_cookie", create_access_token(identity="USER", additional_claims={"role": "customer"}))
+
+    assert client.get("/api/v1/auth/generate-otp?email=a@b.c").status_code == 201
+    # The second merge finds the existing row instead of inserting a duplicate
+    assert client.get("/api/v1/auth/generate-otp?email=a@b.c").status_code == 201
+    assert client.get(f"/api/v1/auth/validate-otp?otp={codes[-1]}").status_code == 200
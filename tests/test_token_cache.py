@@ -0,0 +1,58 @@
+from api.utils.token_cache import LocalBackend, RedisBackend, RevocationCache
+
+
+def test_valid_state_is_not_cached_without_a_shared_backend():
+    cache = RevocationCache()
+
+    cache.set("jti", "USER_0", False)
+
+    assert cache.get("jti", "USER_0") is None
+
+
+def test_revoked_state_is_cached_locally():
+    cache = RevocationCache()
+
+    cache.set("jti", "USER_0", True)
+
+    assert cache.get("jti", "USER_0") is True
+
+
+def test_revoke_on_another_worker_is_seen_through_the_backend():
+    backend = LocalBackend()
+    worker_a, worker_b = RevocationCache(backend), RevocationCache(backend)
+
+    worker_a.set("jti", "USER_0", False)
+    assert worker_b.get("jti", "USER_0") is False
+
+    worker_b.set("jti", "USER_0", True)
+    assert worker_a.get("jti", "USER_0") is True
+
+
+def test_stale_valid_state_never_overwrites_a_revoke():
+    backend = LocalBackend()
+    checker, revoker = RevocationCache(backend), RevocationCache(backend)
+
+    # The check read the token before the revoke committed, and caches after it
+    revoker.set("jti", "USER_0", True)
+    checker.set("jti", "USER_0", False)
+
+    assert RevocationCache(backend).get("jti", "USER_0") is True
+
+
+def test_redis_backend_writes_the_valid_state_only_if_missing():
+    calls = []
+
+    class FakeRedis:
+        def set(self, name, value, **kwargs):
+            calls.append((name, value, kwargs))
+
+    backend = RedisBackend.__new__(RedisBackend)
+    backend._client = FakeRedis()
+
+    backend.set("USER_0:jti", True, 3600)
+    backend.set("USER_0:jti", False, 30)
+
+    assert calls == [
+        ("revocation:USER_0:jti", "1", {"ex": 3600}),
+        ("revocation:USER_0:jti", "0", {"ex": 30, "nx": True}),
+    ]
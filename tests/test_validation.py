@@ -0,0 +1,12 @@
+def test_malformed_json_is_rejected_with_400(client):
+    response = client.post("/api/v1/cars/", data=b"{bad", content_type="application/json")
+
+    assert response.status_code == 400
+    assert response.get_json()["message"] == "Request validation failed"
+
+
+def test_invalid_payload_is_rejected_with_400(client):
+    response = client.post("/api/v1/cars/", json={"license_no": "ABC-1"})
+
+    assert response.status_code == 400
+    assert response.get_json()["details"]